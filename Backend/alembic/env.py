@@ -28,6 +28,21 @@ if config.config_file_name is not None:
 # Target metadata for 'autogenerate'
 target_metadata = Base.metadata  # lowercase 'metadata' ⚠️
 
+# Objects created by hand-written migrations that are not mapped on the models
+# (e.g. Postgres-only generated tsvector columns). Keep autogenerate from dropping them.
+UNMAPPED_OBJECTS = {
+    "search_vector",
+    "ix_jobs_search_vector",
+    "resume_search_vector",
+    "ix_applications_resume_search_vector",
+}
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    if reflected and compare_to is None and name in UNMAPPED_OBJECTS:
+        return False
+    return True
+
 # ------------------ OFFLINE MIGRATIONS ------------------ #
 def run_migrations_offline():
     """Run migrations in 'offline' mode."""
@@ -35,6 +50,7 @@ def run_migrations_offline():
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -52,7 +68,11 @@ def run_migrations_online():
     )
 
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
+        )
 
         with context.begin_transaction():
             context.run_migrations()
@@ -0,0 +1,30 @@
+"""add user image variants
+
+Revision ID: 2d8f6b1e9a47
+Revises: 7e2a5c9d4b18
+Create Date: 2026-10-17 16:24:05.861390
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '2d8f6b1e9a47'
+down_revision: Union[str, Sequence[str], None] = '7e2a5c9d4b18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('avatar_variants', postgresql.JSON(astext_type=sa.Text()), nullable=True))
+    op.add_column('users', sa.Column('logo_variants', postgresql.JSON(astext_type=sa.Text()), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'logo_variants')
+    op.drop_column('users', 'avatar_variants')
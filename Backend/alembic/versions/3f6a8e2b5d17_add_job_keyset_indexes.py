@@ -0,0 +1,32 @@
+"""add job keyset indexes
+
+Revision ID: 3f6a8e2b5d17
+Revises: 9b7d2c41e8a0
+Create Date: 2026-10-17 10:03:27.540812
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f6a8e2b5d17'
+down_revision: Union[str, Sequence[str], None] = '9b7d2c41e8a0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_jobs_active_created_at_id', 'jobs', ['created_at', 'id'], unique=False, postgresql_where=sa.text('is_active'))
+    op.create_index('ix_jobs_active_title_id', 'jobs', ['title', 'id'], unique=False, postgresql_where=sa.text('is_active'))
+    op.create_index('ix_jobs_active_company_id', 'jobs', [sa.text("coalesce(company, '')"), 'id'], unique=False, postgresql_where=sa.text('is_active'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_jobs_active_company_id', table_name='jobs', postgresql_where=sa.text('is_active'))
+    op.drop_index('ix_jobs_active_title_id', table_name='jobs', postgresql_where=sa.text('is_active'))
+    op.drop_index('ix_jobs_active_created_at_id', table_name='jobs', postgresql_where=sa.text('is_active'))
@@ -0,0 +1,32 @@
+"""add application listing indexes
+
+Revision ID: 7e2a5c9d4b18
+Revises: c4d91f7a2b63
+Create Date: 2026-10-17 15:02:47.518203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7e2a5c9d4b18'
+down_revision: Union[str, Sequence[str], None] = 'c4d91f7a2b63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_applications_job_id_created_at_id', 'applications', ['job_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_applications_job_id_status_created_at_id', 'applications', ['job_id', 'status', 'created_at', 'id'], unique=False)
+    op.create_index('ix_applications_user_id_created_at_id', 'applications', ['user_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_applications_user_id_created_at_id', table_name='applications')
+    op.drop_index('ix_applications_job_id_status_created_at_id', table_name='applications')
+    op.drop_index('ix_applications_job_id_created_at_id', table_name='applications')
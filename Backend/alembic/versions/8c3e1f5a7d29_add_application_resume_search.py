@@ -0,0 +1,51 @@
+"""add application resume search
+
+Revision ID: 8c3e1f5a7d29
+Revises: 2d8f6b1e9a47
+Create Date: 2026-10-17 17:10:38.402716
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '8c3e1f5a7d29'
+down_revision: Union[str, Sequence[str], None] = '2d8f6b1e9a47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Weighted document: resume text (A) > cover letter (B)
+APPLICATION_SEARCH_DOCUMENT = (
+    "setweight(to_tsvector('english', coalesce(resume_text, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(cover_letter, '')), 'B')"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('applications', sa.Column('resume_text', sa.Text(), nullable=True))
+    # Generated column, so Postgres keeps it in sync when the extraction task fills resume_text
+    op.add_column(
+        'applications',
+        sa.Column(
+            'resume_search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(APPLICATION_SEARCH_DOCUMENT, persisted=True),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        'ix_applications_resume_search_vector', 'applications', ['resume_search_vector'],
+        unique=False, postgresql_using='gin',
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_applications_resume_search_vector', table_name='applications', postgresql_using='gin')
+    op.drop_column('applications', 'resume_search_vector')
+    op.drop_column('applications', 'resume_text')
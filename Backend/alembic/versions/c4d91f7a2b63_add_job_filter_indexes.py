@@ -0,0 +1,34 @@
+"""add job filter indexes
+
+Revision ID: c4d91f7a2b63
+Revises: 3f6a8e2b5d17
+Create Date: 2026-10-17 13:41:09.227415
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d91f7a2b63'
+down_revision: Union[str, Sequence[str], None] = '3f6a8e2b5d17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_jobs_active_location_created_at', 'jobs', ['location', 'created_at'], unique=False, postgresql_where=sa.text('is_active'))
+    op.create_index('ix_jobs_active_employment_type_created_at', 'jobs', ['employment_type', 'created_at'], unique=False, postgresql_where=sa.text('is_active'))
+    op.create_index('ix_jobs_active_company_created_at', 'jobs', ['company', 'created_at'], unique=False, postgresql_where=sa.text('is_active'))
+    op.create_index('ix_jobs_active_salary', 'jobs', [sa.text('coalesce(salary_max, salary_min)')], unique=False, postgresql_where=sa.text('is_active'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_jobs_active_salary', table_name='jobs', postgresql_where=sa.text('is_active'))
+    op.drop_index('ix_jobs_active_company_created_at', table_name='jobs', postgresql_where=sa.text('is_active'))
+    op.drop_index('ix_jobs_active_employment_type_created_at', table_name='jobs', postgresql_where=sa.text('is_active'))
+    op.drop_index('ix_jobs_active_location_created_at', table_name='jobs', postgresql_where=sa.text('is_active'))
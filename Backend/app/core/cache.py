@@ -0,0 +1,279 @@
+import asyncio
+import json
+import logging
+import math
+import random
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Optional
+
+import orjson
+import redis
+
+from app.core.local_cache import local_cache
+from app.core.redis_client import async_redis_client, async_redis_raw_client, redis_client
+from app.core.responses import dumps, loads
+
+logger = logging.getLogger("app.cache")
+
+
+# Every job listing cache key embeds the current generation, so bumping the
+# counter invalidates all of them at once. Entries of older generations are
+# never read again and simply age out through their TTL.
+JOBS_GENERATION_KEY = "jobs:generation"
+JOBS_CACHE_TTL = 60
+
+# Entries are kept this long past their logical expiry so they can still be
+# served (stale-while-revalidate) while a single worker recomputes them.
+STALE_TTL = 30
+# Recompute lease, long enough for the slowest listing query
+LOCK_TTL_MS = 5000
+# How long a worker with nothing to serve waits for the lease holder
+LOCK_WAIT_SECONDS = 0.5
+LOCK_POLL_SECONDS = 0.05
+# XFetch beta, > 1 refreshes earlier, < 1 later
+EARLY_REFRESH_BETA = 1.0
+
+# Cross-worker invalidation of the in-process tier (see local_cache)
+INVALIDATION_CHANNEL = "cache:invalidate"
+# Re-read the generation from Redis at least this often, in case a message was missed
+GENERATION_RESYNC_SECONDS = 30
+
+# Per-worker counters: hit, miss, stale, early_refresh, lock_wait, lock_timeout
+cache_stats = Counter()
+
+# Generation as last seen by this worker, only trusted while the listener is subscribed
+_local_generation = {"value": None, "synced_at": 0.0}
+_listener_alive = asyncio.Event()
+
+
+@dataclass(frozen=True)
+class CachedPayload:
+    body: bytes  # JSON, ready to be sent as the response body
+    meta: dict
+
+
+# Only delete the lease if we still own it
+_release_lock = async_redis_client.register_script("""
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+""")
+
+
+async def get_jobs_generation() -> int:
+    now = time.monotonic()
+    if _listener_alive.is_set() and _local_generation["value"] is not None \
+            and now - _local_generation["synced_at"] < GENERATION_RESYNC_SECONDS:
+        return _local_generation["value"]
+
+    generation = int(await async_redis_client.get(JOBS_GENERATION_KEY) or 0)
+    _local_generation.update(value=generation, synced_at=now)
+    return generation
+
+
+async def jobs_cache_key(*parts) -> str:
+    # jobs:{generation}:{skip}:{limit}:{q}:{sort_by}:{order}
+    return ":".join(["jobs", str(await get_jobs_generation()), *(str(part) for part in parts)])
+
+
+async def _publish(message: dict):
+    await async_redis_client.publish(INVALIDATION_CHANNEL, json.dumps(message))
+
+
+async def invalidate_jobs_cache() -> int:
+    """Call after any job write (create, update, delete, is_active toggle). O(1)."""
+    generation = await async_redis_client.incr(JOBS_GENERATION_KEY)
+    _local_generation.update(value=generation, synced_at=time.monotonic())
+    await _publish({"op": "generation", "value": generation})
+    return generation
+
+
+async def invalidate_key(key: str):
+    """Drop a single cache entry from Redis and from every worker's local tier."""
+    await invalidate_keys([key])
+
+
+async def invalidate_keys(keys: list[str]):
+    """invalidate_key for many entries, one DEL and one message for all of them."""
+    if not keys:
+        return
+    await async_redis_client.delete(*keys)
+    for key in keys:
+        local_cache.delete(key)
+    await _publish({"op": "delete", "keys": keys})
+
+
+def invalidate_key_sync(key: str):
+    """invalidate_key for sync callers such as Celery tasks."""
+    redis_client.delete(key)
+    local_cache.delete(key)
+    redis_client.publish(INVALIDATION_CHANNEL, json.dumps({"op": "delete", "keys": [key]}))
+
+
+def _handle_invalidation(data: str):
+    message = json.loads(data)
+    if message["op"] == "generation":
+        # generations only move forward, ignore late deliveries
+        if (_local_generation["value"] or 0) < message["value"]:
+            _local_generation.update(value=message["value"], synced_at=time.monotonic())
+    elif message["op"] == "delete":
+        for key in message["keys"]:
+            local_cache.delete(key)
+
+
+async def _listen_for_invalidations():
+    while True:
+        pubsub = async_redis_client.pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.subscribe(INVALIDATION_CHANNEL)
+            # anything published while we were not subscribed is lost, start clean
+            local_cache.clear()
+            generation = int(await async_redis_client.get(JOBS_GENERATION_KEY) or 0)
+            _local_generation.update(value=generation, synced_at=time.monotonic())
+            _listener_alive.set()
+
+            async for message in pubsub.listen():
+                try:
+                    _handle_invalidation(message["data"])
+                except Exception:
+                    # one bad message must not take the listener down
+                    logger.exception("Ignoring malformed cache invalidation %r", message["data"])
+        except redis.RedisError as e:
+            logger.warning("Cache invalidation listener lost Redis, resubscribing: %s", e)
+        finally:
+            # whatever ended the subscription, the local generation is no longer trustworthy
+            _listener_alive.clear()
+            await pubsub.aclose()
+        await asyncio.sleep(1)
+
+
+def start_invalidation_listener() -> asyncio.Task:
+    """Start the per-worker pub/sub listener that keeps the local tier coherent."""
+    return asyncio.create_task(_listen_for_invalidations(), name="cache-invalidation")
+
+
+def _should_refresh(entry: dict, now: float) -> bool:
+    # Probabilistic early expiration (XFetch): the closer to expiry and the more
+    # expensive the recompute, the more likely one request refreshes ahead of time.
+    jitter = entry["delta"] * EARLY_REFRESH_BETA * -math.log(1.0 - random.random())
+    return now + jitter >= entry["expires_at"]
+
+
+def _remember_locally(key: str, entry: dict, size: int):
+    # never keep a local copy past the entry's logical expiry
+    local_cache.set(key, entry, size, ttl=entry["expires_at"] - time.time())
+
+
+# Stored as one header line (expiry, recompute time, meta) followed by the JSON
+# body, so a hit hands the body to the response without parsing it
+def _encode_entry(entry: dict) -> bytes:
+    header = {"expires_at": entry["expires_at"], "delta": entry["delta"], "meta": entry["meta"]}
+    return dumps(header) + b"\n" + entry["body"]
+
+
+def _decode_entry(raw: bytes) -> Optional[dict]:
+    header, separator, body = raw.partition(b"\n")
+    if not separator:
+        # written in an older format, treat as a miss and let it be overwritten
+        return None
+    try:
+        return {**loads(header), "body": body}
+    except orjson.JSONDecodeError:
+        return None
+
+
+async def _read_entry(key: str):
+    entry = local_cache.get(key)
+    if entry is not None:
+        return entry
+
+    raw = await async_redis_raw_client.get(key)
+    if not raw:
+        return None
+
+    entry = _decode_entry(raw)
+    if entry is not None:
+        _remember_locally(key, entry, len(raw))
+    return entry
+
+
+async def _compute_payload(compute: Callable[[], Awaitable[tuple[Any, dict]]]) -> CachedPayload:
+    value, meta = await compute()
+    return CachedPayload(dumps(value), meta)
+
+
+async def _recompute(key: str, compute: Callable[[], Awaitable[tuple[Any, dict]]], ttl: int) -> CachedPayload:
+    started = time.time()
+    payload = await _compute_payload(compute)
+    delta = time.time() - started
+
+    entry = {"body": payload.body, "meta": payload.meta, "expires_at": time.time() + ttl, "delta": delta}
+    raw = _encode_entry(entry)
+    await async_redis_raw_client.set(key, raw, ex=ttl + STALE_TTL)
+    _remember_locally(key, entry, len(raw))
+    return payload
+
+
+def _payload(entry: dict) -> CachedPayload:
+    return CachedPayload(entry["body"], entry["meta"])
+
+
+async def get_or_compute_payload(key: str, compute: Callable[[], Awaitable[tuple[Any, dict]]], ttl: int = JOBS_CACHE_TTL) -> CachedPayload:
+    """
+    Return the cached payload for `key`, awaiting `compute()` and caching it on a miss.
+    `compute` returns (value, meta): the value is stored as its JSON encoding, meta
+    is a small dict of extras that travel with it (e.g. the next page cursor).
+
+    Reads the worker's local tier first, then Redis. Only the worker holding the
+    recompute lease hits the database, the others serve the stale entry or wait
+    briefly for the fresh one.
+    """
+    entry = await _read_entry(key)
+    now = time.time()
+
+    if entry and not _should_refresh(entry, now):
+        cache_stats["hit"] += 1
+        return _payload(entry)
+
+    lock_key = f"lock:{key}"
+    token = uuid.uuid4().hex
+    if await async_redis_client.set(lock_key, token, nx=True, px=LOCK_TTL_MS):
+        if entry is not None and now < entry["expires_at"]:
+            cache_stats["early_refresh"] += 1
+        else:
+            cache_stats["miss"] += 1
+        try:
+            return await _recompute(key, compute, ttl)
+        finally:
+            await _release_lock(keys=[lock_key], args=[token])
+
+    # Someone else is refreshing, the old value is good enough meanwhile
+    if entry is not None:
+        cache_stats["stale"] += 1
+        return _payload(entry)
+
+    cache_stats["lock_wait"] += 1
+    deadline = now + LOCK_WAIT_SECONDS
+    while time.time() < deadline:
+        await asyncio.sleep(LOCK_POLL_SECONDS)
+        entry = await _read_entry(key)
+        if entry is not None:
+            cache_stats["hit"] += 1
+            return _payload(entry)
+
+    # Lease holder is too slow (or died), don't keep the request hanging
+    cache_stats["lock_timeout"] += 1
+    return await _compute_payload(compute)
+
+
+async def get_or_compute(key: str, compute: Callable[[], Awaitable[Any]], ttl: int = JOBS_CACHE_TTL) -> Any:
+    """get_or_compute_payload for callers that want the decoded value back."""
+    async def compute_payload():
+        return await compute(), {}
+
+    payload = await get_or_compute_payload(key, compute_payload, ttl)
+    return loads(payload.body)
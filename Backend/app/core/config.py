@@ -16,6 +16,39 @@ class Settings(BaseSettings):
     GOOGLE_CLIENT_SECRET: str = Field(..., env='GOOGLE_CLIENT_SECRET')
     GOOGLE_REDIRECT_URI: str = Field(..., env='GOOGLE_REDIRECT_URI')
     SESSION_SECRET: str = Field(..., env='SESSION_SECRET')
+    DB_ECHO: bool = Field(False, env='DB_ECHO')
+    DB_POOL_SIZE: int = Field(10, env='DB_POOL_SIZE')
+    DB_MAX_OVERFLOW: int = Field(20, env='DB_MAX_OVERFLOW')
+    DB_POOL_TIMEOUT: int = Field(30, env='DB_POOL_TIMEOUT')
+    DB_POOL_RECYCLE: int = Field(1800, env='DB_POOL_RECYCLE')
+    DB_POOL_PRE_PING: bool = Field(True, env='DB_POOL_PRE_PING')
+    SLOW_QUERY_MS: int = Field(200, env='SLOW_QUERY_MS')
+    ARGON2_TIME_COST: int = Field(3, env='ARGON2_TIME_COST')
+    ARGON2_MEMORY_COST: int = Field(65536, env='ARGON2_MEMORY_COST')  # KiB
+    ARGON2_PARALLELISM: int = Field(4, env='ARGON2_PARALLELISM')
+    PASSWORD_HASH_WORKERS: int = Field(2, env='PASSWORD_HASH_WORKERS')
+    PASSWORD_HASH_MAX_CONCURRENCY: int = Field(8, env='PASSWORD_HASH_MAX_CONCURRENCY')
+    PASSWORD_HASH_QUEUE_TIMEOUT: float = Field(2.0, env='PASSWORD_HASH_QUEUE_TIMEOUT')
+    LOCAL_CACHE_MAX_BYTES: int = Field(32 * 1024 * 1024, env='LOCAL_CACHE_MAX_BYTES')
+    LOCAL_CACHE_TTL: int = Field(5, env='LOCAL_CACHE_TTL')
+    RECOMMENDATION_CACHE_MAX_BYTES: int = Field(16 * 1024 * 1024, env='RECOMMENDATION_CACHE_MAX_BYTES')
+    RECOMMENDATION_CACHE_TTL: int = Field(300, env='RECOMMENDATION_CACHE_TTL')
+    RANKING_CACHE_MAX_BYTES: int = Field(32 * 1024 * 1024, env='RANKING_CACHE_MAX_BYTES')
+    RANKING_CACHE_TTL: int = Field(600, env='RANKING_CACHE_TTL')
+    RATE_LIMIT_ENABLED: bool = Field(True, env='RATE_LIMIT_ENABLED')
+    # "<count>/<second|minute|hour|day>", per client IP (login, register) or per user (apply, create job)
+    RATE_LIMIT_LOGIN: str = Field('10/minute', env='RATE_LIMIT_LOGIN')
+    RATE_LIMIT_REGISTER: str = Field('20/hour', env='RATE_LIMIT_REGISTER')
+    RATE_LIMIT_APPLY: str = Field('30/hour', env='RATE_LIMIT_APPLY')
+    RATE_LIMIT_CREATE_JOB: str = Field('60/hour', env='RATE_LIMIT_CREATE_JOB')
+    RATE_LIMIT_IMPORT_JOBS: str = Field('5/hour', env='RATE_LIMIT_IMPORT_JOBS')  # requests, each up to IMPORT_MAX_ROWS jobs
+    EMAIL_TRANSPORT: str = Field('sendgrid', env='EMAIL_TRANSPORT')  # sendgrid, file or memory
+    EMAIL_FILE_PATH: str = Field('outbox.jsonl', env='EMAIL_FILE_PATH')
+    EMAIL_BATCH_SIZE: int = Field(1000, env='EMAIL_BATCH_SIZE')
+    EMAIL_RATE_PER_SECOND: float = Field(10.0, env='EMAIL_RATE_PER_SECOND')  # provider requests, per worker process
+    EMAIL_RATE_BURST: float = Field(20.0, env='EMAIL_RATE_BURST')
+    EMAIL_MAX_RETRIES: int = Field(3, env='EMAIL_MAX_RETRIES')
+    EMAIL_BACKOFF_BASE: float = Field(0.5, env='EMAIL_BACKOFF_BASE')
 
     class Config:
         env_file = Path(__file__).resolve().parent.parent / ".env"
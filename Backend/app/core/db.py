@@ -1,17 +1,40 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from app.core.config import settings
+from app.core.db_metrics import InstrumentedAsyncQueuePool, InstrumentedQueuePool, instrument_engine
 
 
-engine = create_engine(settings.DATABASE_URL, echo=True)
+def _async_database_url(url: str) -> str:
+    # Same database, async driver: postgresql:// -> postgresql+asyncpg://
+    drivers = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+    scheme, rest = url.split("://", 1)
+    return f"{drivers.get(scheme.split('+')[0], scheme)}://{rest}"
+
+
+pool_options = dict(
+    echo=settings.DB_ECHO,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+)
+
+# Sync engine, used by Alembic and Celery tasks
+engine = create_engine(settings.DATABASE_URL, poolclass=InstrumentedQueuePool, **pool_options)
+instrument_engine(engine)
 
 SessionLocal = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
 
+# Async engine, used by the request path
+async_engine = create_async_engine(_async_database_url(settings.DATABASE_URL), poolclass=InstrumentedAsyncQueuePool, **pool_options)
+instrument_engine(async_engine.sync_engine)
+
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
\ No newline at end of file
@@ -0,0 +1,179 @@
+import hashlib
+import logging
+import re
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.core.config import settings
+
+
+logger = logging.getLogger("app.db")
+
+# ASGI scope of the request being served, set by RequestScopeMiddleware.
+# The matched route is only known once routing ran, so it is resolved lazily.
+current_request_scope: ContextVar[Optional[dict]] = ContextVar("current_request_scope", default=None)
+
+_literals = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b|%\(\w+\)s|\$\d+|:\w+|\?")
+_in_lists = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_whitespace = re.compile(r"\s+")
+
+
+def fingerprint_sql(statement: str) -> tuple[str, str]:
+    """Normalize away literals and bind params, return (fingerprint, normalized sql)."""
+    normalized = _literals.sub("?", statement)
+    normalized = _in_lists.sub("(?)", normalized)
+    normalized = _whitespace.sub(" ", normalized).strip()
+    return hashlib.sha1(normalized.encode()).hexdigest()[:12], normalized
+
+
+class RequestScopeMiddleware:
+    """Publish the request's ASGI scope in current_request_scope while it is served."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        token = current_request_scope.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_request_scope.reset(token)
+
+
+def _current_route() -> Optional[str]:
+    scope = current_request_scope.get()
+    if scope is None:
+        return None
+    route = scope.get("route")
+    path = getattr(route, "path", None) or scope.get("path")
+    return f'{scope.get("method")} {path}'
+
+
+class QueryStats:
+    """Per-process query latency and pool checkout wait, queryable at runtime."""
+
+    def __init__(self, slow_query_ms: float, max_slow_queries: int = 100, max_fingerprints: int = 500):
+        self.slow_query_ms = slow_query_ms
+        self.max_fingerprints = max_fingerprints
+        self.queries = 0
+        self.total_ms = 0.0
+        self.slow_queries = deque(maxlen=max_slow_queries)
+        self.by_fingerprint: dict[str, dict] = {}
+        self.checkouts = 0
+        self.checkout_wait_ms = 0.0
+        self.max_checkout_wait_ms = 0.0
+        self._lock = threading.Lock()
+
+    def record_query(self, statement: str, duration_ms: float):
+        fingerprint, normalized = fingerprint_sql(statement)
+        route = _current_route()
+
+        with self._lock:
+            self.queries += 1
+            self.total_ms += duration_ms
+
+            stats = self.by_fingerprint.get(fingerprint)
+            if stats is None and len(self.by_fingerprint) < self.max_fingerprints:
+                stats = self.by_fingerprint[fingerprint] = {"sql": normalized[:500], "count": 0, "total_ms": 0.0, "max_ms": 0.0}
+            if stats is not None:
+                stats["count"] += 1
+                stats["total_ms"] += duration_ms
+                stats["max_ms"] = max(stats["max_ms"], duration_ms)
+
+            if duration_ms >= self.slow_query_ms:
+                self.slow_queries.append({
+                    "fingerprint": fingerprint,
+                    "sql": normalized[:500],
+                    "duration_ms": round(duration_ms, 2),
+                    "route": route,
+                    "at": time.time(),
+                })
+
+        if duration_ms >= self.slow_query_ms:
+            logger.warning("Slow query %s (%.1f ms) from %s: %s", fingerprint, duration_ms, route, normalized[:200])
+
+    def record_checkout(self, wait_ms: float):
+        with self._lock:
+            self.checkouts += 1
+            self.checkout_wait_ms += wait_ms
+            self.max_checkout_wait_ms = max(self.max_checkout_wait_ms, wait_ms)
+
+    def snapshot(self, top: int = 10) -> dict:
+        with self._lock:
+            slowest = sorted(self.by_fingerprint.items(), key=lambda item: item[1]["total_ms"], reverse=True)[:top]
+            return {
+                "queries": self.queries,
+                "avg_query_ms": round(self.total_ms / self.queries, 3) if self.queries else None,
+                "slow_query_threshold_ms": self.slow_query_ms,
+                "top_by_total_time": [
+                    {"fingerprint": fp, **stats, "avg_ms": round(stats["total_ms"] / stats["count"], 3)}
+                    for fp, stats in slowest
+                ],
+                "recent_slow_queries": list(self.slow_queries),
+                "pool_checkouts": self.checkouts,
+                "avg_checkout_wait_ms": round(self.checkout_wait_ms / self.checkouts, 3) if self.checkouts else None,
+                "max_checkout_wait_ms": round(self.max_checkout_wait_ms, 3),
+            }
+
+
+query_stats = QueryStats(settings.SLOW_QUERY_MS)
+
+
+def _timed_checkout(do_get):
+    # time spent waiting for a free connection (or opening a new one)
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return do_get(self)
+        finally:
+            query_stats.record_checkout((time.perf_counter() - started) * 1000)
+    return _do_get
+
+
+class InstrumentedQueuePool(QueuePool):
+    _do_get = _timed_checkout(QueuePool._do_get)
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    _do_get = _timed_checkout(AsyncAdaptedQueuePool._do_get)
+
+
+def instrument_engine(engine, stats: QueryStats = query_stats):
+    """Record per-statement latency of a (sync) engine, pass async_engine.sync_engine for async ones."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_started_at"].pop()
+        stats.record_query(statement, (time.perf_counter() - started) * 1000)
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(exception_context):
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_started_at"):
+            conn.info["query_started_at"].pop()
+
+
+def pool_status(engine) -> dict:
+    pool = engine.pool
+    if not isinstance(pool, QueuePool):
+        return {"status": pool.status()}
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": pool.overflow(),
+        "status": pool.status(),
+    }
@@ -0,0 +1,71 @@
+"""
+Email templates in app/templates/email.
+
+Every notification is one `<name>.jinja` file with `subject`, `heading`, `html`
+and `text` blocks, so the HTML and plain-text parts come from the same source.
+The HTML part is wrapped in `layout.html`. Templates are compiled once per
+worker process, and rendered emails are cached by (template, context). A bulk
+send renders once and the mailer reuses the result for every recipient.
+Per-recipient values go through mailer substitutions (`-name-`), not the
+template context.
+
+    email = render_email("application_status", status="hired")
+    get_mailer().send(email.subject, email.html, recipients, text_content=email.text)
+"""
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+from jinja2 import Environment, FileSystemLoader, StrictUndefined
+from markupsafe import Markup
+
+TEMPLATE_DIR = Path(__file__).resolve().parent.parent / "templates" / "email"
+
+RENDER_CACHE_SIZE = 512
+
+# Same templates, two environments: the HTML part is autoescaped, the text part must not be
+_html_env = Environment(loader=FileSystemLoader(TEMPLATE_DIR), autoescape=True, undefined=StrictUndefined,
+                        trim_blocks=True, lstrip_blocks=True, auto_reload=False)
+_text_env = Environment(loader=FileSystemLoader(TEMPLATE_DIR), autoescape=False, undefined=StrictUndefined,
+                        trim_blocks=True, lstrip_blocks=True, auto_reload=False)
+
+
+@dataclass(frozen=True)
+class RenderedEmail:
+    subject: str
+    html: str
+    text: str
+
+
+def _render_block(env: Environment, name: str, block: str, context: dict) -> str:
+    template = env.get_template(f"{name}.jinja")
+    return "".join(template.blocks[block](template.new_context(context))).strip()
+
+
+@lru_cache(maxsize=RENDER_CACHE_SIZE)
+def _render(name: str, context_items: tuple) -> RenderedEmail:
+    context = dict(context_items)
+    heading = _render_block(_html_env, name, "heading", context)
+    body = _render_block(_html_env, name, "html", context)
+    html = _html_env.get_template("layout.html").render(heading=Markup(heading), body=Markup(body))
+    return RenderedEmail(
+        subject=_render_block(_text_env, name, "subject", context),
+        html=html,
+        text=_render_block(_text_env, name, "text", context) + "\n",
+    )
+
+
+def render_email(name: str, **context) -> RenderedEmail:
+    """Render `name`.jinja. Context values must be hashable (str, int, ...)."""
+    return _render(name, tuple(sorted(context.items())))
+
+
+def warm_templates():
+    """Compile every template up front, e.g. when a worker process starts."""
+    for env in (_html_env, _text_env):
+        for template in env.list_templates():
+            env.get_template(template)
+
+
+def render_cache_info():
+    return _render.cache_info()
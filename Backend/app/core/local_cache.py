@@ -0,0 +1,76 @@
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Optional
+
+from app.core.config import settings
+
+
+class LocalCache:
+    """
+    Small in-process LRU cache with per-entry TTL, bounded by the approximate
+    size of what it holds (callers pass the serialized payload size).
+    One instance per worker process, sits in front of Redis.
+    """
+
+    def __init__(self, max_bytes: int, default_ttl: float):
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.current_bytes = 0
+        self.stats = Counter()
+        self._entries: "OrderedDict[str, tuple[float, int, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                self.stats["miss"] += 1
+                return None
+
+            expires_at, _, value = item
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                self.stats["expired"] += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.stats["hit"] += 1
+            return value
+
+    def set(self, key: str, value: Any, size: int, ttl: Optional[float] = None):
+        ttl = self.default_ttl if ttl is None else min(ttl, self.default_ttl)
+        if ttl <= 0 or size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + ttl, size, value)
+            self.current_bytes += size
+
+            # least recently used entries go first
+            while self.current_bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.stats["evicted"] += 1
+
+    def delete(self, key: str):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _remove(self, key: str):
+        _, size, _ = self._entries.pop(key)
+        self.current_bytes -= size
+
+
+local_cache = LocalCache(settings.LOCAL_CACHE_MAX_BYTES, settings.LOCAL_CACHE_TTL)
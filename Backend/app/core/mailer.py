@@ -0,0 +1,262 @@
+"""
+Email dispatch for the Celery tasks in app/utils/send_*.py.
+
+A Mailer sends one message body to many recipients. Recipients are grouped into
+batches of up to `EMAIL_BATCH_SIZE` per provider request, each with its own
+substitutions (`-name-` placeholders in subject and content). Requests are
+paced by a token bucket and retried with exponential backoff on throttling and
+server errors. Where the batch goes depends on EMAIL_TRANSPORT:
+
+    sendgrid  SendGrid v3 API over one pooled HTTP client per worker process
+    file      append each batch as a JSON line to EMAIL_FILE_PATH
+    memory    keep batches in a list, for benchmarks and local runs
+"""
+import json
+import logging
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+import httpx
+from sendgrid.helpers.mail import Mail, Personalization, Substitution, To
+
+from app.core.config import settings
+
+logger = logging.getLogger("app.mailer")
+
+SENDGRID_SEND_URL = "https://api.sendgrid.com/v3/mail/send"
+
+# SendGrid allows up to 1000 personalizations per request
+MAX_BATCH_SIZE = 1000
+
+# Throttling and server errors are worth retrying, anything else is our fault
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+
+
+@dataclass
+class Recipient:
+    email: str
+    substitutions: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class EmailBatch:
+    subject: str
+    html_content: str
+    recipients: list[Recipient]
+    text_content: Optional[str] = None
+
+
+class TransientEmailError(Exception):
+    """The provider may accept the same request later."""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class EmailDeliveryError(Exception):
+    """The provider rejected the request, retrying will not help."""
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket, `rate` tokens per second up to `capacity`.
+    `acquire` blocks until enough tokens are available.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens: float = 1) -> float:
+        """Take `tokens`, sleeping as needed. Returns the seconds spent waiting."""
+        tokens = min(tokens, self.capacity)
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill(time.monotonic())
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                delay = (tokens - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class SendGridTransport:
+    """Posts to the SendGrid API over a keep-alive connection pool."""
+
+    def __init__(self, api_key: str, from_email: str, timeout: float = 10.0):
+        self.from_email = from_email
+        self._client = httpx.Client(
+            headers={"Authorization": f"Bearer {api_key}"},
+            timeout=timeout,
+            limits=httpx.Limits(max_keepalive_connections=4),
+        )
+
+    def build_payload(self, batch: EmailBatch) -> dict:
+        message = Mail(from_email=self.from_email, subject=batch.subject,
+                       plain_text_content=batch.text_content, html_content=batch.html_content)
+        for recipient in batch.recipients:
+            personalization = Personalization()
+            personalization.add_to(To(recipient.email))
+            for key, value in recipient.substitutions.items():
+                personalization.add_substitution(Substitution(f"-{key}-", str(value)))
+            message.add_personalization(personalization)
+        return message.get()
+
+    def send(self, batch: EmailBatch):
+        try:
+            response = self._client.post(SENDGRID_SEND_URL, json=self.build_payload(batch))
+        except httpx.TransportError as e:
+            raise TransientEmailError(f"SendGrid unreachable: {e}")
+
+        if response.status_code in RETRYABLE_STATUS:
+            retry_after = response.headers.get("Retry-After")
+            raise TransientEmailError(
+                f"SendGrid returned {response.status_code}",
+                retry_after=float(retry_after) if retry_after and retry_after.isdigit() else None,
+            )
+        if response.status_code >= 400:
+            raise EmailDeliveryError(f"SendGrid returned {response.status_code}: {response.text[:500]}")
+
+    def close(self):
+        self._client.close()
+
+
+class FileTransport:
+    """Appends every batch as one JSON line, substitutions already applied."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def send(self, batch: EmailBatch):
+        lines = [json.dumps(message) for message in render_messages(batch)]
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+
+    def close(self):
+        pass
+
+
+class MemoryTransport:
+    """Keeps every batch it is given."""
+
+    def __init__(self):
+        self.batches: list[EmailBatch] = []
+
+    def send(self, batch: EmailBatch):
+        self.batches.append(batch)
+
+    def close(self):
+        self.batches.clear()
+
+
+def render_messages(batch: EmailBatch) -> list[dict]:
+    """Per-recipient messages the way the provider would render them."""
+    messages = []
+    for recipient in batch.recipients:
+        parts = {"subject": batch.subject, "html": batch.html_content, "text": batch.text_content}
+        for key, value in recipient.substitutions.items():
+            parts = {name: part.replace(f"-{key}-", str(value)) if part else part for name, part in parts.items()}
+        messages.append({"to": recipient.email, **parts})
+    return messages
+
+
+class Mailer:
+    def __init__(self, transport, batch_size: int = MAX_BATCH_SIZE, rate_limiter: Optional[TokenBucket] = None,
+                 max_retries: int = 3, backoff_base: float = 0.5, backoff_max: float = 30.0):
+        self.transport = transport
+        self.batch_size = max(1, min(batch_size, MAX_BATCH_SIZE))
+        self.rate_limiter = rate_limiter
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+    def _backoff(self, attempt: int, error: TransientEmailError) -> float:
+        if error.retry_after is not None:
+            return min(error.retry_after, self.backoff_max)
+        # full jitter, so workers that failed together don't retry together
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def _send_with_retries(self, batch: EmailBatch):
+        for attempt in range(self.max_retries + 1):
+            if self.rate_limiter:
+                self.rate_limiter.acquire()
+            try:
+                self.transport.send(batch)
+                return
+            except TransientEmailError as e:
+                if attempt == self.max_retries:
+                    raise
+                delay = self._backoff(attempt, e)
+                logger.warning("Email batch of %d failed (%s), retry %d in %.2fs", len(batch.recipients), e, attempt + 1, delay)
+                time.sleep(delay)
+
+    def send(self, subject: str, html_content: str, recipients: list[Recipient], text_content: Optional[str] = None) -> int:
+        """
+        Send one message to every recipient, batch by batch. Returns how many
+        recipients were handed to the provider; failed batches are logged and
+        skipped so one bad batch doesn't hold back the rest.
+        """
+        sent = 0
+        for start in range(0, len(recipients), self.batch_size):
+            batch = EmailBatch(subject, html_content, recipients[start:start + self.batch_size], text_content)
+            try:
+                self._send_with_retries(batch)
+            except (TransientEmailError, EmailDeliveryError) as e:
+                logger.error("Email batch of %d to %s... not sent: %s", len(batch.recipients), batch.recipients[0].email, e)
+                continue
+            sent += len(batch.recipients)
+        logger.info("Sent %r to %d of %d recipients", subject, sent, len(recipients))
+        return sent
+
+
+def build_transport(name: str):
+    if name == "sendgrid":
+        return SendGridTransport(settings.SENDGRID_API_KEY, settings.MAIL_FROM)
+    if name == "file":
+        return FileTransport(settings.EMAIL_FILE_PATH)
+    if name == "memory":
+        return MemoryTransport()
+    raise ValueError(f"Unknown EMAIL_TRANSPORT {name!r}, expected sendgrid, file or memory")
+
+
+_mailer: dict = {"pid": None, "instance": None}
+_mailer_lock = threading.Lock()
+
+
+def get_mailer() -> Mailer:
+    """
+    One Mailer (and one HTTP connection pool) per process. Celery's prefork pool
+    forks after import, so the instance is created lazily and rebuilt in a child
+    rather than sharing the parent's sockets.
+    """
+    pid = os.getpid()
+    if _mailer["pid"] != pid:
+        with _mailer_lock:
+            if _mailer["pid"] != pid:
+                rate_limiter = None
+                if settings.EMAIL_RATE_PER_SECOND > 0:
+                    rate_limiter = TokenBucket(settings.EMAIL_RATE_PER_SECOND, settings.EMAIL_RATE_BURST)
+                _mailer["instance"] = Mailer(
+                    build_transport(settings.EMAIL_TRANSPORT),
+                    batch_size=settings.EMAIL_BATCH_SIZE,
+                    rate_limiter=rate_limiter,
+                    max_retries=settings.EMAIL_MAX_RETRIES,
+                    backoff_base=settings.EMAIL_BACKOFF_BASE,
+                )
+                _mailer["pid"] = pid
+    return _mailer["instance"]
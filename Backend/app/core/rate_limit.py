@@ -0,0 +1,110 @@
+"""
+Distributed rate limiting for auth and write endpoints.
+
+Every (route, client) pair gets a token bucket in Redis, refilled and spent by
+one Lua script, so all API workers share the same budget and concurrent
+requests cannot race each other. Limits are "count/period" strings from
+settings (e.g. "10/minute"), the bucket holds `count` tokens and refills at
+count/period per second, which allows short bursts up to `count`.
+
+    @router.post('/login', dependencies=[Depends(rate_limit_by_ip("login", settings.RATE_LIMIT_LOGIN))])
+
+Over the limit the request gets a 429 with Retry-After. When Redis is down
+the limiter lets requests through rather than taking the endpoints down too.
+"""
+import logging
+import math
+
+import redis
+from fastapi import Depends, HTTPException, Request
+
+from app.core.config import settings
+from app.core.redis_client import async_redis_client
+from app.models.user import User
+from app.utils.functions import get_current_user
+
+logger = logging.getLogger("app.rate_limit")
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+# KEYS[1] bucket; ARGV rate (tokens/s), capacity, cost.
+# Returns {allowed, seconds until `cost` tokens are available}. The clock is Redis'
+# own, so API servers with skewed clocks still agree on the refill.
+_take_token = async_redis_client.register_script("""
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+
+local allowed = 0
+local retry_after = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+else
+    retry_after = (cost - tokens) / rate
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+-- an untouched bucket is full again after capacity / rate seconds, no need to keep it
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return {allowed, tostring(retry_after)}
+""")
+
+
+def parse_rate(spec: str) -> tuple[int, int]:
+    """'10/minute' -> (10, 60)"""
+    count, _, period = spec.partition("/")
+    try:
+        return int(count), PERIODS[period.strip().lower()]
+    except (ValueError, KeyError):
+        raise ValueError(f"Invalid rate limit {spec!r}, expected '<count>/<second|minute|hour|day>'")
+
+
+async def hit(scope: str, identity: str, count: int, period: int):
+    """Spend one token of `identity`'s bucket for `scope`, raise a 429 when it is empty."""
+    if not settings.RATE_LIMIT_ENABLED:
+        return
+
+    try:
+        allowed, retry_after = await _take_token(keys=[f"ratelimit:{scope}:{identity}"], args=[count / period, count, 1])
+    except redis.RedisError as e:
+        # fail open, an unthrottled endpoint beats an unavailable one
+        logger.warning("Rate limiter unavailable, letting %s request from %s through: %s", scope, identity, e)
+        return
+
+    if not int(allowed):
+        raise HTTPException(
+            status_code=429,
+            detail="Too many requests, please try again later",
+            headers={"Retry-After": str(max(1, math.ceil(float(retry_after))))},
+        )
+
+
+def client_ip(request: Request) -> str:
+    # behind a reverse proxy this is only the real client when uvicorn runs with --proxy-headers
+    return request.client.host if request.client else "unknown"
+
+
+def rate_limit_by_ip(scope: str, spec: str):
+    """Dependency limiting `scope` per client IP, for endpoints used before login."""
+    count, period = parse_rate(spec)
+
+    async def dependency(request: Request):
+        await hit(scope, f"ip:{client_ip(request)}", count, period)
+    return dependency
+
+
+def rate_limit_by_user(scope: str, spec: str):
+    """Dependency limiting `scope` per authenticated user."""
+    count, period = parse_rate(spec)
+
+    async def dependency(current_user: User = Depends(get_current_user)):
+        await hit(scope, f"user:{current_user.id}", count, period)
+    return dependency
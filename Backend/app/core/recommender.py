@@ -0,0 +1,298 @@
+"""
+Job recommendations from seeker skills.
+
+Each worker process keeps a sparse TF-IDF matrix (jobs x terms) over the title
+and description of active jobs. A seeker's skills become one query vector, and
+a single sparse matrix-vector product scores every job at once.
+
+The index follows job writes through the jobs cache generation. When the
+generation has moved, only jobs whose created_at/updated_at is past the last
+refresh are re-tokenized, and ids that are no longer active are dropped. The
+matrix itself is then reassembled from the per-job term arrays with numpy,
+which costs O(non-zeros) and no Python loop over documents.
+
+The same terms rank a job's applicants the other way round: score_profiles
+turns every applicant's skills/experience into one sparse matrix and scores
+it against the job's terms in a single product.
+"""
+import asyncio
+import hashlib
+import json
+import re
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+
+import anyio
+import numpy as np
+from scipy.sparse import csr_matrix
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import get_jobs_generation
+from app.core.config import settings
+from app.core.local_cache import LocalCache
+from app.models.job import Job
+
+# Keeps tokens like c++, c#, node.js and .net in one piece
+TOKEN_RE = re.compile(r"[a-z0-9.+#]*[a-z0-9+#]")
+STOP_WORDS = frozenset("""
+a an and are as at be by for from has have in is it its of on or our that the their this to was
+we will with you your job role team work working looking experience years year position
+""".split())
+
+# Title terms count this many times as much as description terms
+TITLE_WEIGHT = 2
+# Job edits can commit a little after their updated_at, re-read that much history on every refresh
+REFRESH_SLACK = timedelta(seconds=60)
+
+
+def tokenize(text: Optional[str]) -> list[str]:
+    if not text:
+        return []
+    return [token for token in TOKEN_RE.findall(text.lower()) if token not in STOP_WORDS and len(token) > 1]
+
+
+def job_terms(title: Optional[str], description: Optional[str]) -> Counter:
+    """Terms of a job posting, title terms weighted TITLE_WEIGHT times."""
+    terms = Counter(tokenize(description))
+    for token in tokenize(title):
+        terms[token] += TITLE_WEIGHT
+    return terms
+
+
+def _profile_strings(skills: Optional[Iterable], experience: Optional[Iterable]) -> Iterable[str]:
+    for skill in skills or ():
+        if isinstance(skill, str):
+            yield skill
+    for entry in experience or ():
+        if isinstance(entry, dict) and isinstance(entry.get("title"), str):
+            yield entry["title"]
+
+
+def skill_terms(skills: Optional[Iterable], experience: Optional[Iterable] = None) -> Counter:
+    """Query terms for a seeker: every skill, plus the titles from their experience."""
+    terms = Counter()
+    for text in _profile_strings(skills, experience):
+        terms.update(tokenize(text))
+    return terms
+
+
+def score_profiles(job_terms: Counter, profiles: list[tuple]) -> np.ndarray:
+    """
+    Cosine similarity of every (skills, experience) profile to the job terms.
+
+    Profiles are flattened into a (profile x distinct string) count matrix and
+    each distinct skill/title is tokenized once into a (string x term) matrix,
+    applicants mostly list the same handful of skills. Their product holds the
+    term counts of every profile, and one matrix-vector product scores them all.
+    """
+    n_profiles = len(profiles)
+    string_ids: dict[str, int] = {}
+    rows, strings = [], []
+    for row, (skills, experience) in enumerate(profiles):
+        for text in _profile_strings(skills, experience):
+            rows.append(row)
+            strings.append(string_ids.setdefault(text, len(string_ids)))
+
+    job_weights = {term: 1.0 + np.log(count) for term, count in job_terms.items()}
+    if not strings or not job_weights:
+        return np.zeros(n_profiles)
+
+    vocabulary: dict[str, int] = {}
+    token_rows, token_columns = [], []
+    for string_id, text in enumerate(string_ids):
+        for token in tokenize(text):
+            token_rows.append(string_id)
+            token_columns.append(vocabulary.setdefault(token, len(vocabulary)))
+
+    # duplicate (row, column) pairs are summed, which is exactly the term count
+    entries = csr_matrix((np.ones(len(rows)), (rows, strings)), shape=(n_profiles, len(string_ids)))
+    tokens = csr_matrix((np.ones(len(token_rows)), (token_rows, token_columns)), shape=(len(string_ids), len(vocabulary)))
+    counts = (entries @ tokens).tocsr()
+    counts.data = 1.0 + np.log(counts.data)
+
+    row_norms = np.sqrt(np.asarray(counts.multiply(counts).sum(axis=1)).ravel())
+    row_norms[row_norms == 0] = 1.0
+
+    query = np.zeros(len(vocabulary))
+    for term, weight in job_weights.items():
+        column = vocabulary.get(term)
+        if column is not None:
+            query[column] = weight
+    # the norm covers every job term, including those no applicant has
+    query_norm = np.sqrt(sum(weight ** 2 for weight in job_weights.values()))
+    return (counts @ query) / (row_norms * query_norm)
+
+
+class JobIndex:
+    def __init__(self):
+        self.vocabulary: dict[str, int] = {}
+        # job id -> (term columns, sublinear term frequencies)
+        self.documents: dict[int, tuple[np.ndarray, np.ndarray]] = {}
+        self.document_frequency = np.zeros(0)
+
+        self.generation: Optional[int] = None
+        self.watermark: Optional[datetime] = None
+
+        # (job ids, matrix, idf) of the last rebuild. Rebuilds run in a worker thread while
+        # score() runs on the event loop, so the three are only ever published together.
+        self._snapshot: tuple[np.ndarray, Optional[csr_matrix], np.ndarray] = (np.zeros(0, dtype=np.int64), None, np.zeros(0))
+        self._lock = asyncio.Lock()
+
+    def __len__(self):
+        return len(self.documents)
+
+    def _columns(self, terms: Counter, grow: bool) -> tuple[np.ndarray, np.ndarray]:
+        vocabulary = self.vocabulary
+        if grow:
+            columns = [vocabulary.setdefault(term, len(vocabulary)) for term in terms]
+            counts = list(terms.values())
+        else:
+            known = [(vocabulary[term], count) for term, count in terms.items() if term in vocabulary]
+            columns = [column for column, _ in known]
+            counts = [count for _, count in known]
+        # sublinear term frequency
+        return np.asarray(columns, dtype=np.int32), 1.0 + np.log(np.asarray(counts, dtype=np.float64))
+
+    def _grow_frequencies(self):
+        if len(self.document_frequency) < len(self.vocabulary):
+            # grow geometrically, the vocabulary gains a few terms with almost every new job
+            size = max(len(self.vocabulary), 2 * len(self.document_frequency))
+            self.document_frequency = np.pad(self.document_frequency, (0, size - len(self.document_frequency)))
+
+    def remove(self, job_id: int):
+        document = self.documents.pop(job_id, None)
+        if document is not None:
+            self.document_frequency[document[0]] -= 1
+
+    def upsert(self, job_id: int, title: Optional[str], description: Optional[str]):
+        self.remove(job_id)
+        columns, weights = self._columns(job_terms(title, description), grow=True)
+        self._grow_frequencies()
+        self.documents[job_id] = (columns, weights)
+        self.document_frequency[columns] += 1
+
+    def rebuild_matrix(self):
+        """Reassemble the TF-IDF matrix (rows L2-normalised) from the per-job arrays."""
+        job_ids = np.fromiter(self.documents.keys(), dtype=np.int64, count=len(self.documents))
+        documents = list(self.documents.values())
+        lengths = np.fromiter((len(columns) for columns, _ in documents), dtype=np.int64, count=len(documents))
+        indptr = np.concatenate(([0], np.cumsum(lengths)))
+        columns = np.concatenate([columns for columns, _ in documents]) if documents else np.zeros(0, dtype=np.int32)
+        weights = np.concatenate([weights for _, weights in documents]) if documents else np.zeros(0)
+
+        n_documents = len(documents)
+        idf = np.log((1 + n_documents) / (1 + self.document_frequency[:len(self.vocabulary)])) + 1.0
+        data = weights * idf[columns]
+
+        # per-row L2 norm, so scores are cosine similarities
+        rows = np.repeat(np.arange(n_documents), lengths)
+        row_norms = np.sqrt(np.bincount(rows, weights=data ** 2, minlength=n_documents))
+        row_norms[row_norms == 0] = 1.0
+        data = data / np.repeat(row_norms, lengths)
+
+        matrix = csr_matrix((data, columns, indptr), shape=(n_documents, len(idf)))
+        self._snapshot = (job_ids, matrix, idf)
+
+    def score(self, terms: Counter, limit: int) -> list[tuple[int, float]]:
+        """Top `limit` (job id, cosine similarity) pairs for the query terms."""
+        job_ids, matrix, idf = self._snapshot
+        if matrix is None or not len(job_ids):
+            return []
+        columns, weights = self._columns(terms, grow=False)
+        # terms added by a refresh that is still running are not in this matrix yet
+        in_matrix = columns < matrix.shape[1]
+        columns, weights = columns[in_matrix], weights[in_matrix]
+        if not len(columns):
+            return []
+
+        query = np.zeros(matrix.shape[1])
+        query[columns] = weights * idf[columns]
+        scores = matrix @ (query / np.linalg.norm(query))
+
+        candidates = np.flatnonzero(scores > 0)
+        if len(candidates) > limit:
+            candidates = candidates[np.argpartition(scores[candidates], -limit)[-limit:]]
+        ranked = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return [(int(job_ids[i]), float(scores[i])) for i in ranked]
+
+    async def refresh(self, db: AsyncSession):
+        """Bring the index up to date with the jobs table if any job was written since the last refresh."""
+        generation = await get_jobs_generation()
+        if generation == self.generation:
+            return
+
+        async with self._lock:
+            if generation == self.generation:
+                return
+
+            changed_at = func.coalesce(Job.updated_at, Job.created_at)
+            query = select(Job.id, Job.title, Job.description, Job.is_active, changed_at.label("changed_at"))
+            if self.watermark is None:
+                query = query.where(Job.is_active == True)
+            else:
+                query = query.where(changed_at >= self.watermark - REFRESH_SLACK)
+
+            rows = (await db.execute(query)).all()
+            active_ids = None
+            if self.watermark is not None:
+                # deleted rows leave nothing to find by timestamp
+                active_ids = set((await db.scalars(select(Job.id).where(Job.is_active == True))).all())
+
+            # tokenizing and rebuilding is CPU work, keep it off the event loop
+            self.watermark = await anyio.to_thread.run_sync(self._apply, rows, active_ids)
+            self.generation = generation
+
+    def _apply(self, rows, active_ids: Optional[set]) -> Optional[datetime]:
+        watermark = self.watermark
+        for row in rows:
+            if row.is_active:
+                self.upsert(row.id, row.title, row.description)
+            else:
+                self.remove(row.id)
+            if row.changed_at and (watermark is None or row.changed_at > watermark):
+                watermark = row.changed_at
+
+        if active_ids is not None:
+            for job_id in self.documents.keys() - active_ids:
+                self.remove(job_id)
+
+        self.rebuild_matrix()
+        return watermark
+
+
+job_index = JobIndex()
+
+# Per-user results, keyed by jobs generation and the seeker's terms so both edits retire them
+recommendation_cache = LocalCache(settings.RECOMMENDATION_CACHE_MAX_BYTES, settings.RECOMMENDATION_CACHE_TTL)
+
+
+# Applicant rankings per (job, applicant set version, status filter), see crud.application
+ranking_cache = LocalCache(settings.RANKING_CACHE_MAX_BYTES, settings.RANKING_CACHE_TTL)
+
+
+def _terms_digest(terms: Counter) -> str:
+    return hashlib.sha1(json.dumps(sorted(terms.items())).encode()).hexdigest()[:12]
+
+
+async def recommend_jobs(user, db: AsyncSession, limit: int) -> list[dict]:
+    terms = skill_terms(getattr(user, "skills", None), getattr(user, "experience", None))
+    if not terms:
+        return []
+
+    await job_index.refresh(db)
+    cache_key = f"recommended:{user.id}:{job_index.generation}:{_terms_digest(terms)}:{limit}"
+    cached = recommendation_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    ranked = job_index.score(terms, limit)
+    jobs = {}
+    if ranked:
+        rows = await db.scalars(select(Job).where(Job.id.in_([job_id for job_id, _ in ranked]), Job.is_active == True))
+        jobs = {job.id: job for job in rows.all()}
+
+    result = [{**jobs[job_id].as_dict(), "score": round(score, 4)} for job_id, score in ranked if job_id in jobs]
+    recommendation_cache.set(cache_key, result, size=len(json.dumps(result)))
+    return result
@@ -1,8 +1,26 @@
 import redis
+import redis.asyncio
 
 redis_client = redis.Redis(
     host='localhost',
     port=6379,
     db=0,
     decode_responses=True
-)
\ No newline at end of file
+)
+
+# Used on the request path so Redis round-trips don't block the event loop
+async_redis_client = redis.asyncio.Redis(
+    host='localhost',
+    port=6379,
+    db=0,
+    decode_responses=True
+)
+
+# Same server, but values come back as bytes: cached JSON payloads are sent to
+# clients as they are stored, decoding them to str would only copy them twice
+async_redis_raw_client = redis.asyncio.Redis(
+    host='localhost',
+    port=6379,
+    db=0,
+    decode_responses=False
+)
@@ -0,0 +1,30 @@
+from typing import Any
+
+import orjson
+from starlette.responses import Response
+
+# Same wire format as FastAPI's pydantic serialization: UTC datetimes end in "Z",
+# naive ones (SQLite) carry no offset
+DUMPS_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def dumps(value: Any) -> bytes:
+    return orjson.dumps(value, option=DUMPS_OPTIONS)
+
+
+def loads(data: bytes | str) -> Any:
+    return orjson.loads(data)
+
+
+class ORJSONResponse(Response):
+    """
+    JSON response rendered with orjson. Bytes are taken as an already encoded
+    JSON body and sent as they are, which is how cached payloads go out without
+    being decoded or validated against the response model again.
+    """
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, (bytes, bytearray, memoryview)):
+            return bytes(content)
+        return dumps(content)
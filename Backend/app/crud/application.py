@@ -1,25 +1,65 @@
+from datetime import datetime
+import anyio
+import numpy as np
 from fastapi import HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import func, literal_column, select, tuple_, update
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 from app.models.job import Job
 from app.models.application import Application
+from app.models.user import User
+from app.core.recommender import job_terms, ranking_cache, score_profiles
+from app.core.redis_client import async_redis_client
+from app.utils.pagination import decode_cursor, encode_cursor, keyset_row
+from app.utils.search import build_prefix_tsquery, supports_full_text
 
+ALLOWED_STATUSES = {'applied', 'under_review', 'shortlisted', 'hired', 'rejected'}
 
+# Generated, GIN-indexed tsvector over resume_text (A) and cover_letter (B), created by
+# migration 8c3e1f5a7d29. It is Postgres-only, so it is not mapped on the Application model.
+application_search_vector = literal_column("applications.resume_search_vector", type_=TSVECTOR)
 
+APPLICATIONS_PAGE_SIZE = 50
+APPLICATIONS_MAX_PAGE_SIZE = 200
 
-def create_application(
+# Listing projection: everything but the cover letter text, which is fetched on demand
+application_summary_columns = (
+    Application.id,
+    Application.job_id,
+    Application.user_id,
+    Application.resume_path,
+    Application.resume_filename,
+    Application.status,
+    Application.created_at,
+    Application.cover_letter.isnot(None).label('has_cover_letter'),
+)
+
+
+# Per-job version of the applicant set, bumped whenever an application is added or
+# changes status. Cached rankings are keyed by it; edits to an applicant's profile
+# are only picked up when the ranking expires (RANKING_CACHE_TTL).
+def applicants_version_key(job_id: int) -> str:
+    return f'applications:{job_id}:version'
+
+
+async def invalidate_applicants(job_id: int):
+    await async_redis_client.incr(applicants_version_key(job_id))
+
+
+async def create_application(
         job_id: int,
         user_id: int,
         cover_letter: Optional[str],
         resume_path: Optional[str],
         resume_filename: Optional[str],
-        db: Session
+        db: AsyncSession
         ) -> Application:
-    job = db.query(Job).filter(Job.id == job_id, Job.is_active == True).first()
+    job = await db.scalar(select(Job).where(Job.id == job_id, Job.is_active == True))
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    existing = db.query(Application).filter(Application.job_id == job_id, Application.user_id == user_id).first()
+    existing = await db.scalar(select(Application).where(Application.job_id == job_id, Application.user_id == user_id))
     if existing:
         raise HTTPException(status_code=409, detail="You have already applied to this job")
     
@@ -33,29 +73,181 @@ def create_application(
     )
 
     db.add(app)
-    db.commit()
-    db.refresh(app)
+    await db.commit()
+    await db.refresh(app)
+    await invalidate_applicants(job_id)
     return app
 
 
-def get_applications_for_job(job_id: int, db: Session) -> list[Application]:
-    return db.query(Application).filter(Application.job_id == job_id).order_by(Application.created_at.desc()).all()
+# Newest first, keyset paginated on (created_at, id) so every page is an index range scan
+async def _get_applications_page(criteria, status: Optional[str], cursor: Optional[str], limit: Optional[int], db: AsyncSession):
+    if status is not None and status not in ALLOWED_STATUSES:
+        raise HTTPException(status_code=400, detail=f'invalid status, Allowed status: {ALLOWED_STATUSES}')
+
+    limit = max(1, min(limit or APPLICATIONS_PAGE_SIZE, APPLICATIONS_MAX_PAGE_SIZE))
+    query = select(*application_summary_columns).where(criteria)
+
+    if status is not None:
+        query = query.where(Application.status == status)
+
+    if cursor:
+        created_at, application_id = decode_cursor(cursor, lambda data: (datetime.fromisoformat(data["c"]), int(data["id"])))
+        created_at_column, created_at = keyset_row(db, Application.created_at, created_at)
+        query = query.where(tuple_(created_at_column, Application.id) < tuple_(created_at, application_id))
+
+    # one extra row tells us whether there is a next page
+    query = query.order_by(Application.created_at.desc(), Application.id.desc()).limit(limit + 1)
+    rows = (await db.execute(query)).mappings().all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        next_cursor = encode_cursor({"c": last["created_at"].isoformat(), "id": last["id"]})
+    return rows[:limit], next_cursor
+
+
+async def get_applications_for_job(job_id: int, db: AsyncSession, status: Optional[str] = None, cursor: Optional[str] = None, limit: Optional[int] = None):
+    return await _get_applications_page(Application.job_id == job_id, status, cursor, limit, db)
+
+
+async def get_applications_for_user(user_id: int, db: AsyncSession, status: Optional[str] = None, cursor: Optional[str] = None, limit: Optional[int] = None):
+    return await _get_applications_page(Application.user_id == user_id, status, cursor, limit, db)
+
+
+# Keyword search within one job's applicants, best matches first. Uses the resume
+# tsvector index on Postgres and falls back to ILIKE elsewhere (SQLite tests).
+async def search_applicants(job_id: int, q: str, db: AsyncSession, status: Optional[str] = None, skip: int = 0, limit: Optional[int] = None):
+    if status is not None and status not in ALLOWED_STATUSES:
+        raise HTTPException(status_code=400, detail=f'invalid status, Allowed status: {ALLOWED_STATUSES}')
+
+    limit = max(1, min(limit or APPLICATIONS_PAGE_SIZE, APPLICATIONS_MAX_PAGE_SIZE))
+    query = select(*application_summary_columns).where(Application.job_id == job_id)
+
+    if status is not None:
+        query = query.where(Application.status == status)
+
+    if supports_full_text(db):
+        tsquery_text = build_prefix_tsquery(q)
+        if not tsquery_text:
+            return []
+        tsquery = func.to_tsquery('english', tsquery_text)
+        rank = func.ts_rank_cd(application_search_vector, tsquery)
+        query = query.add_columns(rank.label('rank')).where(application_search_vector.op('@@')(tsquery))
+        query = query.order_by(rank.desc(), Application.created_at.desc(), Application.id.desc())
+    else:
+        like = f'%{q}%'
+        query = query.where(Application.resume_text.ilike(like) | Application.cover_letter.ilike(like))
+        query = query.order_by(Application.created_at.desc(), Application.id.desc())
 
+    return (await db.execute(query.offset(skip).limit(limit))).mappings().all()
 
-def get_applications_for_user(user_id: int, db: Session) -> list[Application]:
-    return db.query(Application).filter(Application.user_id == user_id).order_by(Application.created_at.desc()).all()
 
+# (application ids, scores) of a job's applicants, best match first. Computed once per
+# applicant set version and then served from the per-process ranking cache.
+async def _rank_applicants(job: Job, status: Optional[str], db: AsyncSession) -> tuple[np.ndarray, np.ndarray]:
+    version = int(await async_redis_client.get(applicants_version_key(job.id)) or 0)
+    job_changed_at = job.updated_at or job.created_at
+    cache_key = f"ranked:{job.id}:{version}:{job_changed_at.timestamp() if job_changed_at else 0}:{status or ''}"
+    cached = ranking_cache.get(cache_key)
+    if cached is not None:
+        return cached
 
-def get_application_by_id(application_id: int, db: Session) -> Optional[Application]:
-    return db.query(Application).filter(Application.id == application_id).first()
+    # only the JSON that is scored, newest first so that equal scores keep that order
+    query = (
+        select(Application.id, User.skills, User.experience)
+        .join(User, User.id == Application.user_id)
+        .where(Application.job_id == job.id)
+    )
+    if status is not None:
+        query = query.where(Application.status == status)
+    rows = (await db.execute(query.order_by(Application.created_at.desc(), Application.id.desc()))).all()
+
+    ids = np.fromiter((row.id for row in rows), dtype=np.int64, count=len(rows))
+    profiles = [(row.skills, row.experience) for row in rows]
+    # scoring tens of thousands of applicants is CPU work, keep it off the event loop
+    scores = await anyio.to_thread.run_sync(score_profiles, job_terms(job.title, job.description), profiles)
+
+    order = np.argsort(-scores, kind="stable")
+    ranked = (ids[order], scores[order])
+    ranking_cache.set(cache_key, ranked, size=ids.nbytes + scores.nbytes)
+    return ranked
+
+
+# Applicants of a job ordered by how well their skills and experience match the posting.
+# skip/limit select the top-k window of the cached ranking; only that page is read back.
+async def get_ranked_applications(job: Job, db: AsyncSession, status: Optional[str] = None, skip: int = 0, limit: Optional[int] = None):
+    if status is not None and status not in ALLOWED_STATUSES:
+        raise HTTPException(status_code=400, detail=f'invalid status, Allowed status: {ALLOWED_STATUSES}')
+
+    limit = max(1, min(limit or APPLICATIONS_PAGE_SIZE, APPLICATIONS_MAX_PAGE_SIZE))
+    ids, scores = await _rank_applicants(job, status, db)
+    page_ids = ids[skip:skip + limit].tolist()
+    if not page_ids:
+        return []
+
+    rows = (await db.execute(select(*application_summary_columns).where(Application.id.in_(page_ids)))).mappings().all()
+    by_id = {row['id']: row for row in rows}
+    page_scores = scores[skip:skip + limit].tolist()
+    return [{**by_id[app_id], 'score': round(score, 4)} for app_id, score in zip(page_ids, page_scores) if app_id in by_id]
+
+
+# Resume location plus what is needed to authorize reading it, None when the application does not exist
+async def get_resume(application_id: int, db: AsyncSession):
+    result = await db.execute(
+        select(Application.resume_path, Application.resume_filename, Application.user_id, Job.owner_id)
+        .join(Job, Job.id == Application.job_id)
+        .where(Application.id == application_id)
+    )
+    return result.mappings().first()
 
 
-def update_application_status(application_id: int, new_status: str, db: Session) -> Optional[Application]:
-    app = get_application_by_id(application_id,db)
+# Cover letter plus what is needed to authorize reading it, None when the application does not exist
+async def get_cover_letter(application_id: int, db: AsyncSession):
+    result = await db.execute(
+        select(Application.cover_letter, Application.user_id, Job.owner_id)
+        .join(Job, Job.id == Application.job_id)
+        .where(Application.id == application_id)
+    )
+    return result.mappings().first()
+
+
+async def get_application_by_id(application_id: int, db: AsyncSession) -> Optional[Application]:
+    return await db.scalar(select(Application).where(Application.id == application_id))
+
+
+async def update_application_status(application_id: int, new_status: str, db: AsyncSession) -> Optional[Application]:
+    app = await get_application_by_id(application_id,db)
     if not app:
         return None
     app.status = new_status
     db.add(app)
-    db.commit()
-    db.refresh(app)
-    return app
\ No newline at end of file
+    await db.commit()
+    await db.refresh(app)
+    await invalidate_applicants(app.job_id)
+    return app
+
+
+# Set-based status change for many applications of one job. Returns the
+# (application_id, applicant_email) pairs that actually changed, so callers
+# can notify only those applicants.
+async def bulk_update_application_status(job_id: int, application_ids: list[int], new_status: str, db: AsyncSession) -> list[tuple[int, str]]:
+    result = await db.execute(
+        update(Application)
+        .where(
+            Application.job_id == job_id,
+            Application.id.in_(set(application_ids)),
+            Application.status != new_status,
+        )
+        .values(status=new_status)
+        .returning(Application.id, Application.user_id)
+        .execution_options(synchronize_session=False)
+    )
+    changed = result.all()
+    await db.commit()
+    if not changed:
+        return []
+    await invalidate_applicants(job_id)
+
+    user_ids = {user_id for _, user_id in changed}
+    emails = dict((await db.execute(select(User.id, User.email).where(User.id.in_(user_ids)))).all())
+    return [(app_id, emails[user_id]) for app_id, user_id in changed if user_id in emails]
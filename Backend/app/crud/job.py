@@ -1,77 +1,378 @@
-from typing import Optional
-from fastapi import HTTPException
-from sqlalchemy import String, asc, cast, desc
-from sqlalchemy.orm import Session
-from app.core.redis_client import redis_client
-from app.schemas.job import JobCreate,JobUpdate
+import hashlib
+from datetime import datetime
+from typing import AsyncIterator, Optional
+from pydantic import ValidationError
+from sqlalchemy import String, and_, asc, case, cast, desc, false, func, insert, literal_column, select, tuple_
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.responses import dumps
+from app.core.cache import CachedPayload, get_or_compute_payload, invalidate_jobs_cache, invalidate_key, invalidate_keys, jobs_cache_key
+from app.schemas.job import JobCreate,JobFilters,JobUpdate
 from app.models.job import Job
-import json
+from app.utils.pagination import decode_cursor, encode_cursor, keyset_row
+from app.utils.search import build_prefix_tsquery, supports_full_text
 
 
-def create_job(job_create: JobCreate, owner_id: int, db: Session):
+# Generated, GIN-indexed tsvector column (title > company > description), created by
+# migration 9b7d2c41e8a0. It is Postgres-only, so it is not mapped on the Job model.
+job_search_vector = literal_column("jobs.search_vector", type_=TSVECTOR)
+
+# Salary bands of the facet sidebar, (min, max) with max exclusive, None = open ended
+SALARY_BANDS = [(0, 50_000), (50_000, 100_000), (100_000, 150_000), (150_000, 250_000), (250_000, None)]
+FACET_LIMIT = 50
+
+# Bulk import: rows per INSERT/transaction, and how many row errors are reported back
+IMPORT_BATCH_SIZE = 500
+IMPORT_MAX_ERRORS = 1000
+IMPORT_MAX_ROWS = 50_000
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+# JobOut fields in JobOut order. Cached reads select these columns and serialize the
+# rows directly, without building ORM instances or going through the response model.
+job_out_columns = (
+    Job.title,
+    Job.description,
+    Job.location,
+    Job.salary_min,
+    Job.salary_max,
+    Job.employment_type,
+    Job.company,
+    Job.is_active,
+    Job.id,
+    Job.owner_id,
+    Job.created_at,
+    Job.updated_at,
+)
+
+# Keyset sort keys, each paired with Job.id as tiebreaker. They match the partial
+# (key, id) indexes on active jobs declared on the Job model.
+keyset_sort_fields = {
+    "created_at": Job.created_at,
+    "title": Job.title,
+    "company": func.coalesce(Job.company, ''),
+}
+
+
+async def create_job(job_create: JobCreate, owner_id: int, db: AsyncSession):
     payload = job_create.model_dump()
     user = Job(**payload, owner_id=owner_id)
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
+
+    await invalidate_jobs_cache()
+    # a detail lookup may have cached "not found" for this id already
+    await invalidate_key(job_detail_cache_key(user.id))
     return user
 
+# Bulk import of streamed rows (see utils/bulk_import). Rows are validated
+# against JobCreate and inserted with one multi-row INSERT and one commit per
+# batch. The listing cache is invalidated once at the end, the detail entries of
+# the new ids (which may hold a cached "not found") after each batch.
+async def import_jobs(records: AsyncIterator, owner_id: int, db: AsyncSession) -> dict:
+    imported = 0
+    failed = 0
+    errors = []
+    batch = []
+
+    def add_error(row: int, messages: list[str]):
+        nonlocal failed
+        failed += 1
+        if len(errors) < IMPORT_MAX_ERRORS:
+            errors.append({"row": row, "errors": messages})
+
+    async def flush():
+        nonlocal imported
+        if not batch:
+            return
+        ids = (await db.execute(insert(Job).returning(Job.id), batch)).scalars().all()
+        await db.commit()
+        await invalidate_keys([job_detail_cache_key(job_id) for job_id in ids])
+        imported += len(batch)
+        batch.clear()
+
+    try:
+        async for row, record in records:
+            if row > IMPORT_MAX_ROWS:
+                add_error(row, [f"Import is limited to {IMPORT_MAX_ROWS} rows"])
+                break
+
+            if isinstance(record, str):
+                add_error(row, [record])
+                continue
+
+            try:
+                job = JobCreate.model_validate(record)
+            except ValidationError as e:
+                add_error(row, [f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}" for err in e.errors()])
+                continue
+
+            batch.append({**job.model_dump(), "owner_id": owner_id})
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                await flush()
+
+        await flush()
+    finally:
+        # earlier batches are committed even if the stream breaks off
+        if imported:
+            await invalidate_jobs_cache()
+
+    return {
+        "imported": imported,
+        "failed": failed,
+        "errors": errors,
+        "errors_truncated": failed > len(errors),
+    }
+
 # def get_jobs(db: Session):
 #     jobs = db.query(Job).all()
 #     return jobs
-def get_jobs(db: Session, skip: int, limit: int, q: Optional[str] = None, sort_by: str = 'created_at', order: str = 'desc'):
-    cache_key = f'jobs:{skip}:{limit}:{q or None}:{sort_by}:{order}'
-
-    cached_jobs = redis_client.get(cache_key)
-    if cached_jobs:
-        print("Jobs Fetched from Redis cache")
-        return json.loads(cached_jobs)
-
-    query = db.query(Job).filter(Job.is_active == True)
-
-    if q:
-        like = f'%{q}%'
-        query = query.filter(
-            (Job.title.ilike(like)) |
-            (Job.description.ilike(like)) |
-            (cast(Job.created_at, String).ilike(like)) |
-            (Job.company.ilike(like))
-        )
-    
+
+def _apply_text_search(query, db: AsyncSession, q: str):
+    """
+    Filter `query` by the search text `q`, return (query, rank_expression).
+    Uses the tsvector index on Postgres and falls back to ILIKE elsewhere (SQLite tests),
+    in which case rank_expression is None.
+    """
+    if supports_full_text(db):
+        tsquery_text = build_prefix_tsquery(q)
+        if not tsquery_text:
+            return query.where(false()), None
+        tsquery = func.to_tsquery('english', tsquery_text)
+        rank = func.ts_rank_cd(job_search_vector, tsquery)
+        return query.where(job_search_vector.op('@@')(tsquery)), rank
+
+    like = f'%{q}%'
+    query = query.where(
+        (Job.title.ilike(like)) |
+        (Job.description.ilike(like)) |
+        (cast(Job.created_at, String).ilike(like)) |
+        (Job.company.ilike(like))
+    )
+    return query, None
+
+
+def _apply_filters(query, filters: Optional[JobFilters]):
+    if filters is None:
+        return query
+    if filters.location:
+        query = query.where(Job.location == filters.location)
+    if filters.employment_type:
+        query = query.where(Job.employment_type == filters.employment_type)
+    if filters.company:
+        query = query.where(Job.company == filters.company)
+    if filters.salary_min is not None:
+        query = query.where(func.coalesce(Job.salary_max, Job.salary_min) >= filters.salary_min)
+    if filters.salary_max is not None:
+        query = query.where(func.coalesce(Job.salary_min, Job.salary_max) <= filters.salary_max)
+    if filters.posted_since is not None:
+        query = query.where(Job.created_at >= filters.posted_since)
+    return query
+
+
+def _filters_key(filters: Optional[JobFilters]) -> str:
+    if filters is None:
+        return ''
+    return '&'.join(f'{name}={value}' for name, value in sorted(filters.model_dump(exclude_none=True).items()))
+
+
+def _apply_sort(query, sort_by: Optional[str], order: Optional[str], rank=None):
     sortable_field = {
         "title": Job.title,
         "created_at": Job.created_at,
         "company": Job.company
     }
+
+    if sort_by == "relevance" and rank is not None:
+        # best match first, newest first among equally ranked jobs
+        return query.order_by(desc(rank), desc(Job.created_at))
+
     sort_field = sortable_field.get(sort_by, Job.created_at)
 
     if order == "asc":
-        query = query.order_by(asc(sort_field))
-    else:
-        query = query.order_by(desc(sort_field))
+        return query.order_by(asc(sort_field))
+    return query.order_by(desc(sort_field))
 
-    jobs = query.offset(skip).limit(limit).all()
-    
-    # Handle empty results gracefully and cache them to avoid repeated database queries
-    if not jobs:
-        jobs_data = []
-        # Cache an empty list to prevent repeated DB lookups for non-existent searches
-        redis_client.setex(cache_key, 60, json.dumps(jobs_data))
-        return jobs_data
 
-    jobs_data = [job.as_dict() for job in jobs]
-    redis_client.setex(cache_key, 60, json.dumps(jobs_data))
+async def get_jobs(db: AsyncSession, skip: int, limit: int, q: Optional[str] = None, sort_by: str = 'created_at', order: str = 'desc', filters: Optional[JobFilters] = None) -> CachedPayload:
+    skip = skip or 0
+    limit = clamp_page_size(limit)
+    cache_key = await jobs_cache_key(skip, limit, q or None, sort_by, order, _filters_key(filters))
+
+    async def load():
+        query = _apply_filters(select(*job_out_columns).where(Job.is_active == True), filters)
+
+        if q:
+            query, _ = _apply_text_search(query, db, q)
+
+        query = _apply_sort(query, sort_by, order)
+
+        # Empty results are cached as well, so non-existent searches don't keep hitting the database
+        rows = (await db.execute(query.offset(skip).limit(limit))).all()
+        return [row._asdict() for row in rows], {}
+
+    return await get_or_compute_payload(cache_key, load)
+
 
-    return jobs_data
+def clamp_page_size(limit: Optional[int]) -> int:
+    if not limit:
+        return DEFAULT_PAGE_SIZE
+    return max(1, min(limit, MAX_PAGE_SIZE))
 
 
+def _keyset_value(job: Job, sort_by: str):
+    if sort_by == "created_at":
+        return job.created_at.isoformat()
+    if sort_by == "company":
+        return job.company or ''
+    return job.title
 
-def get_job_by_id(job_id: int, db: Session):
-    return db.query(Job).filter(Job.id == job_id).first()
 
+def encode_job_cursor(job: Job, sort_by: str, order: str) -> str:
+    return encode_cursor({"s": sort_by, "o": order, "v": _keyset_value(job, sort_by), "id": job.id})
 
-def update_job(updated_job:JobUpdate, job_id:int, owner_id: int ,db: Session):
-    job = get_job_by_id(job_id,db)
+
+def decode_job_cursor(cursor: str, sort_by: str, order: str):
+    """Return the (sort value, id) a cursor points at, a 400 unless it was issued for this sort."""
+    def parse(data: dict):
+        if data["s"] != sort_by or data["o"] != order:
+            raise ValueError("cursor was issued for a different sort")
+        value = data["v"]
+        if sort_by == "created_at":
+            value = datetime.fromisoformat(value)
+        return value, int(data["id"])
+
+    return decode_cursor(cursor, parse)
+
+
+# Cursor based pagination, every page costs the same index range scan
+async def get_jobs_page(db: AsyncSession, cursor: Optional[str], limit: Optional[int], q: Optional[str] = None, sort_by: Optional[str] = 'created_at', order: Optional[str] = 'desc', filters: Optional[JobFilters] = None):
+    sort_by = sort_by if sort_by in keyset_sort_fields else "created_at"
+    order = "asc" if order == "asc" else "desc"
+    limit = clamp_page_size(limit)
+
+    sort_field = keyset_sort_fields[sort_by]
+    position = decode_job_cursor(cursor, sort_by, order) if cursor else None
+    cache_key = await jobs_cache_key('cursor', cursor, limit, q or None, sort_by, order, _filters_key(filters))
+
+    async def load():
+        query = _apply_filters(select(*job_out_columns).where(Job.is_active == True), filters)
+
+        if q:
+            query, _ = _apply_text_search(query, db, q)
+
+        if position:
+            sort_column, sort_value = keyset_row(db, sort_field, position[0])
+            row = tuple_(sort_column, Job.id)
+            if order == "asc":
+                query = query.where(row > tuple_(sort_value, position[1]))
+            else:
+                query = query.where(row < tuple_(sort_value, position[1]))
+
+        if order == "asc":
+            query = query.order_by(asc(sort_field), asc(Job.id))
+        else:
+            query = query.order_by(desc(sort_field), desc(Job.id))
+
+        # one extra row tells us whether there is a next page
+        rows = (await db.execute(query.limit(limit + 1))).all()
+        next_cursor = encode_job_cursor(rows[limit - 1], sort_by, order) if len(rows) > limit else None
+        return [row._asdict() for row in rows[:limit]], {"next_cursor": next_cursor}
+
+    page = await get_or_compute_payload(cache_key, load)
+    return page, page.meta["next_cursor"]
+
+
+# Ranked full-text search over active jobs
+async def search_jobs(db: AsyncSession, q: str, skip: int = 0, limit: int = 20, sort_by: str = 'relevance', order: str = 'desc', filters: Optional[JobFilters] = None) -> CachedPayload:
+    cache_key = await jobs_cache_key('search', skip, limit, q, sort_by, order, _filters_key(filters))
+
+    async def load():
+        query = _apply_filters(select(*job_out_columns).where(Job.is_active == True), filters)
+        query, rank = _apply_text_search(query, db, q)
+        query = _apply_sort(query, sort_by, order, rank)
+        rows = (await db.execute(query.offset(skip).limit(limit))).all()
+        return [row._asdict() for row in rows], {}
+
+    return await get_or_compute_payload(cache_key, load)
+
+
+
+# Facet counts for the filter sidebar. Computed once per cache generation (and
+# filter combination), job writes bump the generation so the counts follow.
+async def get_job_facets(db: AsyncSession, filters: Optional[JobFilters] = None) -> CachedPayload:
+    cache_key = await jobs_cache_key('facets', _filters_key(filters))
+
+    async def load():
+        active = _apply_filters(select(Job).where(Job.is_active == True), filters).subquery()
+
+        async def count_by(column):
+            rows = await db.execute(
+                select(column, func.count())
+                .where(column.isnot(None))
+                .group_by(column)
+                .order_by(func.count().desc(), column)
+                .limit(FACET_LIMIT)
+            )
+            return [{"value": value, "count": count} for value, count in rows]
+
+        salary = func.coalesce(active.c.salary_max, active.c.salary_min)
+        band = case(
+            *[
+                (and_(salary >= low, salary < high) if high is not None else salary >= low, index)
+                for index, (low, high) in enumerate(SALARY_BANDS)
+            ],
+            else_=None,
+        )
+        band_counts = dict((await db.execute(
+            select(band, func.count()).where(salary.isnot(None)).group_by(band)
+        )).all())
+
+        return {
+            "locations": await count_by(active.c.location),
+            "employment_types": await count_by(active.c.employment_type),
+            "salary_bands": [
+                {"min": low, "max": high, "count": band_counts.get(index, 0)}
+                for index, (low, high) in enumerate(SALARY_BANDS)
+            ],
+        }, {}
+
+    return await get_or_compute_payload(cache_key, load)
+
+
+async def get_job_by_id(job_id: int, db: AsyncSession):
+    return await db.scalar(select(Job).where(Job.id == job_id))
+
+
+def job_detail_cache_key(job_id: int) -> str:
+    return f'job:{job_id}'
+
+
+# Strong ETag of a job detail response, a digest of the representation itself so it
+# changes with every edit, however close to the previous write (SQLite timestamps are
+# only second-precise)
+def job_etag(job: dict) -> str:
+    return f'"job-{job["id"]}-{hashlib.sha1(dumps(job)).hexdigest()[:16]}"'
+
+
+# Cached read for the job detail page, None when the job does not exist
+async def get_job_detail(job_id: int, db: AsyncSession) -> Optional[CachedPayload]:
+    async def load():
+        row = (await db.execute(select(*job_out_columns).where(Job.id == job_id))).first()
+        if row is None:
+            # misses are cached too, meta tells them apart without decoding the body
+            return None, {"found": False}
+        job = row._asdict()
+        return job, {"found": True, "etag": job_etag(job)}
+
+    payload = await get_or_compute_payload(job_detail_cache_key(job_id), load)
+    return payload if payload.meta["found"] else None
+
+
+async def update_job(updated_job:JobUpdate, job_id:int, owner_id: int ,db: AsyncSession):
+    job = await get_job_by_id(job_id,db)
     if not job:
         return None
     
@@ -80,32 +381,31 @@ def update_job(updated_job:JobUpdate, job_id:int, owner_id: int ,db: Session):
         setattr(job,key,value)
 
     db.add(job)
-    db.commit()
-    db.refresh(job)
-
-    with redis_client.pipeline() as pipe:
-        for key in redis_client.scan_iter("jobs:*"):
-            pipe.delete(key)
-        pipe.execute()
-        
+    await db.commit()
+    await db.refresh(job)
+
+    await invalidate_jobs_cache()
+    await invalidate_key(job_detail_cache_key(job_id))
     return job
 
     
     
 
 
-def delete_job(job_id:int,db:Session):
-    job = get_job_by_id(job_id, db)
+async def delete_job(job_id:int,db:AsyncSession):
+    job = await get_job_by_id(job_id, db)
     if job:
-        db.delete(job)
-        db.commit()
+        await db.delete(job)
+        await db.commit()
+        await invalidate_jobs_cache()
+        await invalidate_key(job_detail_cache_key(job_id))
     return job
 
 
-def get_jobs_for_employer(owner_id: int, db: Session):
-    return (
-        db.query(Job)
-        .filter(Job.owner_id == owner_id)
+async def get_jobs_for_employer(owner_id: int, db: AsyncSession):
+    result = await db.scalars(
+        select(Job)
+        .where(Job.owner_id == owner_id)
         .order_by(Job.created_at.desc())
-        .all()
-    )
\ No newline at end of file
+    )
+    return result.all()
\ No newline at end of file
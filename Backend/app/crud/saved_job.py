@@ -1,20 +1,66 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import contains_eager
+from app.core.cache import get_or_compute, jobs_cache_key
+from app.core.redis_client import async_redis_client
 from app.models.saved_job import SavedJob
 
-def toggle_save_job(db: Session, user_id: int, job_id: int):
+SAVED_JOBS_PAGE_SIZE = 100
+SAVED_JOBS_MAX_PAGE_SIZE = 500
+
+
+# Per-user version, bumped on every save/unsave. Cached pages are keyed by it and
+# by the jobs generation, so both toggles and job writes retire old pages.
+def saved_jobs_version_key(user_id: int) -> str:
+    return f'saved_jobs:{user_id}:version'
+
+
+async def invalidate_saved_jobs(user_id: int):
+    await async_redis_client.incr(saved_jobs_version_key(user_id))
+
+
+async def toggle_save_job(db: AsyncSession, user_id: int, job_id: int):
     # Check if already saved
-    existing_save = db.query(SavedJob).filter_by(user_id=user_id, job_id=job_id).first()
+    existing_save = await db.scalar(select(SavedJob).filter_by(user_id=user_id, job_id=job_id))
     
     if existing_save:
-        db.delete(existing_save)
-        db.commit()
+        await db.delete(existing_save)
+        await db.commit()
+        await invalidate_saved_jobs(user_id)
         return {"status": "unsaved"}
     
     new_save = SavedJob(user_id=user_id, job_id=job_id)
     db.add(new_save)
-    db.commit()
-    db.refresh(new_save)
+    await db.commit()
+    await db.refresh(new_save)
+    await invalidate_saved_jobs(user_id)
     return {"status": "saved"}
 
-def get_saved_jobs_for_user(db: Session, user_id: int):
-    return db.query(SavedJob).filter(SavedJob.user_id == user_id).all()
\ No newline at end of file
+async def get_saved_jobs_for_user(db: AsyncSession, user_id: int, skip: int = 0, limit: int = SAVED_JOBS_PAGE_SIZE):
+    limit = max(1, min(limit, SAVED_JOBS_MAX_PAGE_SIZE))
+    version = int(await async_redis_client.get(saved_jobs_version_key(user_id)) or 0)
+    cache_key = await jobs_cache_key('saved', user_id, version, skip, limit)
+
+    async def load():
+        # One joined query; SavedJobOut nests the job, and lazy loading is not available on an AsyncSession
+        result = await db.scalars(
+            select(SavedJob)
+            .join(SavedJob.job)
+            .options(contains_eager(SavedJob.job))
+            .where(SavedJob.user_id == user_id)
+            .order_by(SavedJob.created_at.desc(), SavedJob.id.desc())
+            .offset(skip)
+            .limit(limit)
+        )
+        return [
+            {
+                "id": saved.id,
+                "user_id": saved.user_id,
+                "job_id": saved.job_id,
+                "created_at": saved.created_at.isoformat() if saved.created_at else None,
+                "job": saved.job.as_dict(),
+            }
+            for saved in result.all()
+        ]
+
+    return await get_or_compute(cache_key, load)
@@ -1,76 +1,124 @@
-from sqlalchemy.orm import Session
+import logging
+
+import redis
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.schemas.user import ProfileUpdate, UserCreate,UserUpdate
 from app.models.user import User, UserRole
-from app.core.security import hash_password
+from app.core.cache import get_or_compute, invalidate_key
+from app.core.security import hash_password_async
 from fastapi import HTTPException
 
+logger = logging.getLogger("app.auth")
+
+
+# Short lived cache of the authenticated user (local tier + Redis), so resolving
+# the caller of a request usually doesn't touch Postgres. Every write to a user
+# must call invalidate_principal.
+PRINCIPAL_CACHE_TTL = 60
+PRINCIPAL_FIELDS = (
+    "id", "email", "role", "name", "email_verified", "is_active", "location",
+    "bio", "skills", "experience", "avatar_path", "avatar_filename", "avatar_variants",
+    "company_name", "company_website", "company_description", "logo_path", "logo_filename", "logo_variants",
+)
+
 
 # Create User
-def create_user(user_create: UserCreate,db: Session):
-    existing = db.query(User).filter(User.email == user_create.email).first()
+async def create_user(user_create: UserCreate,db: AsyncSession):
+    existing = await db.scalar(select(User).where(User.email == user_create.email))
     if existing:
         raise HTTPException(status_code=400, detail='Email already exists')
     user = User(
         name=user_create.name,
         email=user_create.email,
-        password_hash=hash_password(user_create.password),
+        password_hash=await hash_password_async(user_create.password),
         role = user_create.role or UserRole.SEEKER.value
 
         )
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
     return user
 
 # Read single user
-def get_user_by_id(user_id:int,db: Session):
-    return db.query(User).filter(User.id == user_id).first()
+async def get_user_by_id(user_id:int,db: AsyncSession):
+    return await db.scalar(select(User).where(User.id == user_id))
 
 # Read Users
-def get_users(db: Session):
-    return db.query(User).all()
+async def get_users(db: AsyncSession):
+    return (await db.scalars(select(User))).all()
 
 # Update User
-def update_user(user_id: int, user_update:UserUpdate, db:Session):
-    user = db.query(User).filter(User.id == user_id).first()
+async def update_user(user_id: int, user_update:UserUpdate, db:AsyncSession):
+    user = await db.scalar(select(User).where(User.id == user_id))
     if not user:
         return None
     user.name = user_update.name
-    user.password_hash = hash_password(user_update.password)
-    db.commit()
-    db.refresh(user)
+    user.password_hash = await hash_password_async(user_update.password)
+    await db.commit()
+    await db.refresh(user)
+    await invalidate_principal(user.email)
     return user
 
 # Delete User
-def delete_user(user_id:int, db: Session):
-    user = db.query(User).filter(User.id == user_id).first()
+async def delete_user(user_id:int, db: AsyncSession):
+    user = await db.scalar(select(User).where(User.id == user_id))
     if not user:
         return None
-    db.delete(user)
-    db.commit()
+    await db.delete(user)
+    await db.commit()
+    await invalidate_principal(user.email)
     return user
 
 # Get User By Email
-def get_user_by_email(email: str, db: Session):
-    user = db.query(User).filter(User.email == email).first()
+async def get_user_by_email(email: str, db: AsyncSession):
+    user = await db.scalar(select(User).where(User.email == email))
     if not user:
         raise HTTPException(status_code=404, detail="User With that email not found")
     
     return user
 
+# Store a rehashed password (cost parameters changed since it was hashed)
+async def update_password_hash(user: User, password_hash: str, db: AsyncSession):
+    user.password_hash = password_hash
+    await db.commit()
+    return user
+
+# Resolve the authenticated user, served from the principal cache when possible.
+# Returns a detached User carrying PRINCIPAL_FIELDS only (no password hash).
+async def get_principal(email: str, db: AsyncSession) -> User:
+    async def load():
+        user = await get_user_by_email(email, db)
+        return {field: getattr(user, field) for field in PRINCIPAL_FIELDS}
+
+    try:
+        data = await get_or_compute(principal_cache_key(email), load, ttl=PRINCIPAL_CACHE_TTL)
+    except redis.RedisError as e:
+        # the cache is an optimisation, authentication only needs the database
+        logger.warning("Principal cache unavailable, loading %s from the database: %s", email, e)
+        return await get_user_by_email(email, db)
+    return User(**data)
+
+def principal_cache_key(email: str) -> str:
+    return f'principal:{email}'
+
+async def invalidate_principal(email: str):
+    await invalidate_key(principal_cache_key(email))
+
 # Verify User Email
-def verify_user_email(user: User, db: Session):
+async def verify_user_email(user: User, db: AsyncSession):
     user.email_verified = True
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
+    await invalidate_principal(user.email)
     return user
 
 # Code to update the profile and images starts here
 
 # Update Profile
-def update_profile(user_id: int, payload: dict, db: Session):
+async def update_profile(user_id: int, payload: dict, db: AsyncSession):
 
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.scalar(select(User).where(User.id == user_id))
     if not user:
         raise HTTPException(status_code=404, detail="User not found!")
     
@@ -78,44 +126,50 @@ def update_profile(user_id: int, payload: dict, db: Session):
         setattr(user, key, value)
 
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
+    await invalidate_principal(user.email)
     return user
 
 # Update Avatar
-def update_avatar(user_id: int, avatar_path: str, avatar_filename: str, db: Session):
+async def update_avatar(user_id: int, avatar_path: str, avatar_filename: str, db: AsyncSession):
 
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.scalar(select(User).where(User.id == user_id))
     if not user:
         raise HTTPException(status_code=404, detail="User not found!")
     
     user.avatar_path = avatar_path
     user.avatar_filename = avatar_filename
+    # variants of the previous image are stale, new ones are generated in the background
+    user.avatar_variants = None
 
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
+    await invalidate_principal(user.email)
     return user
 
 # Update Logo
-def update_logo(user_id: int, logo_path: str, logo_filename: str, db: Session):
+async def update_logo(user_id: int, logo_path: str, logo_filename: str, db: AsyncSession):
 
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.scalar(select(User).where(User.id == user_id))
     if not user:
         raise HTTPException(status_code=404, detail="User not found!")
     
     user.logo_path = logo_path
     user.logo_filename = logo_filename
+    user.logo_variants = None
 
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
+    await invalidate_principal(user.email)
     return user
 
 # Update Company Profile
-def update_company_profile(user_id: int, payload: dict, db: Session):
+async def update_company_profile(user_id: int, payload: dict, db: AsyncSession):
 
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.scalar(select(User).where(User.id == user_id))
     if not user:
         raise HTTPException(status_code=404, detail="User not found!")
     
@@ -123,6 +177,7 @@ def update_company_profile(user_id: int, payload: dict, db: Session):
         setattr(user, key, value)
 
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
+    await invalidate_principal(user.email)
     return user
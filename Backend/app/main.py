@@ -1,13 +1,32 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from app.core.config import settings
+from app.core.cache import start_invalidation_listener
+from app.core.db import async_engine
+from app.core.db_metrics import RequestScopeMiddleware
+from app.core.security import shutdown_hash_pool
+from app.utils.files import UploadSizeLimitMiddleware
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.sessions import SessionMiddleware
-from app.routes import user,auth,job,application,google_auth, saved_job
+from app.routes import user,auth,job,application,google_auth, saved_job, metrics, media
 
 
 
 
-app = FastAPI(title="Job Board App")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    listener = start_invalidation_listener()
+    yield
+    listener.cancel()
+    shutdown_hash_pool()
+    await async_engine.dispose()
+
+
+app = FastAPI(title="Job Board App", lifespan=lifespan)
+
+# Refuse oversized uploads before the multipart body is spooled. Added first so it
+# sits inside CORS and its 413s still carry the CORS headers.
+app.add_middleware(UploadSizeLimitMiddleware)
 
 # Allow frontend (Next.js) to talk to backend
 # origins = [
@@ -21,6 +40,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],   # Allow all methods
     allow_headers=["*"],   # Allow all headers
+    expose_headers=["X-Next-Cursor", "ETag", "Retry-After"],
 )
 
 app.add_middleware(
@@ -29,6 +49,9 @@ app.add_middleware(
     https_only=False
 )
 
+# Lets the query instrumentation attribute slow queries to the calling route
+app.add_middleware(RequestScopeMiddleware)
+
 @app.get('/')
 def get_home():
     return {"message": 'Job Board API with FastAPI + PostgresQL'}
@@ -38,4 +61,6 @@ app.include_router(auth.router)
 app.include_router(job.router)
 app.include_router(application.router)
 app.include_router(google_auth.router)
-app.include_router(saved_job.router)
\ No newline at end of file
+app.include_router(saved_job.router)
+app.include_router(metrics.router)
+app.include_router(media.router)
\ No newline at end of file
@@ -1,5 +1,5 @@
 # models/application.py
-from sqlalchemy import Column, Integer, ForeignKey, String, Text, DateTime, func
+from sqlalchemy import Column, Integer, ForeignKey, String, Text, DateTime, Index, func
 from sqlalchemy.orm import relationship
 from app.core.db import Base  # adjust import if Base lives elsewhere
 
@@ -13,10 +13,19 @@ class Application(Base):
     resume_path = Column(String(512), nullable=True)   # local path to resume file
     resume_filename = Column(String(255), nullable=True)
     cover_letter = Column(Text, nullable=True)
+    # plain text pulled out of the resume by the extract_resume_text task, feeds resume_search_vector
+    resume_text = Column(Text, nullable=True)
 
     status = Column(String(50), default="applied", nullable=False)  # applied, under_review, shortlisted, rejected, hired
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    # listings are keyset paginated newest first, per job (optionally by status) and per applicant
+    __table_args__ = (
+        Index('ix_applications_job_id_created_at_id', 'job_id', 'created_at', 'id'),
+        Index('ix_applications_job_id_status_created_at_id', 'job_id', 'status', 'created_at', 'id'),
+        Index('ix_applications_user_id_created_at_id', 'user_id', 'created_at', 'id'),
+    )
+
     # relationships
     job = relationship("Job", back_populates="applications")
     user = relationship("User", back_populates="applications")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, func, DateTime, Text , ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, func, DateTime, Text , ForeignKey, Index, text
 from sqlalchemy.orm import relationship
 from app.core.db import Base
 
@@ -24,6 +24,18 @@ class Job(Base):
     owner = relationship("User", back_populates="jobs")
     applications = relationship('Application', back_populates='job', cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # (sort key, id) indexes for keyset pagination over active jobs
+        Index('ix_jobs_active_created_at_id', 'created_at', 'id', postgresql_where=text('is_active')),
+        Index('ix_jobs_active_title_id', 'title', 'id', postgresql_where=text('is_active')),
+        Index('ix_jobs_active_company_id', func.coalesce(company, ''), 'id', postgresql_where=text('is_active')),
+        # structured filters (newest first within a facet value) and facet counts
+        Index('ix_jobs_active_location_created_at', 'location', 'created_at', postgresql_where=text('is_active')),
+        Index('ix_jobs_active_employment_type_created_at', 'employment_type', 'created_at', postgresql_where=text('is_active')),
+        Index('ix_jobs_active_company_created_at', 'company', 'created_at', postgresql_where=text('is_active')),
+        Index('ix_jobs_active_salary', func.coalesce(salary_max, salary_min), postgresql_where=text('is_active')),
+    )
+
 
 
     def as_dict(self):
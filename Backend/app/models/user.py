@@ -36,6 +36,8 @@ class User(Base):
     # profile picture
     avatar_path = Column(String(512), nullable=True)
     avatar_filename = Column(String(255), nullable=True)
+    # resized WebP copies made in the background, {"64": "media/avatars/<uuid>_64.webp", ...}
+    avatar_variants = Column(JSON, nullable=True)
 
     # employer/company fields (used when role == "employer")
     company_name = Column(String(255), nullable=True)
@@ -43,6 +45,7 @@ class User(Base):
     company_description = Column(Text, nullable=True)
     logo_path = Column(String(512), nullable=True)
     logo_filename = Column(String(255), nullable=True)
+    logo_variants = Column(JSON, nullable=True)
     
     last_login = Column(DateTime, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -1,13 +1,18 @@
 from typing import Optional
-from sqlalchemy.orm import Session
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Depends
-from app.utils.send_app_status_email import send_app_status_email
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Depends, Query, Request, Response
+from app.utils.send_app_status_email import BULK_EMAIL_CHUNK, send_app_status_email, send_bulk_app_status_email
 from app.models.job import Job
 from app.utils.files import save_resume_file
+from app.utils.media import PRIVATE_CACHE_CONTROL, media_file_response, resolve_media_path
 from app.utils.send_app_email import send_app_email
+from app.utils.resume_text import extract_resume_text
+from app.core.config import settings
 from app.core.db import get_db
+from app.core.rate_limit import rate_limit_by_user
 from app.models.user import User
-from app.schemas.application import ApplicationOut, ApplicationUpdateStatus
+from app.schemas.application import ApplicantSearchResult, ApplicationBulkStatusResult, ApplicationBulkStatusUpdate, ApplicationOut, ApplicationSummaryOut, ApplicationUpdateStatus, CoverLetterOut, RankedApplicantOut
 from app.utils.functions import get_current_user
 from app.crud import application as crud_app
 from app.crud import job as crud_job
@@ -17,13 +22,13 @@ from app.crud import job as crud_job
 router = APIRouter(prefix="/applications", tags=["Applications"])
 
 # Apply for the Job
-@router.post('/jobs/{job_id}/apply', response_model=ApplicationOut)
+@router.post('/jobs/{job_id}/apply', response_model=ApplicationOut, dependencies=[Depends(rate_limit_by_user('apply', settings.RATE_LIMIT_APPLY))])
 async def apply_to_job(
     job_id: int,
     current_user: User = Depends(get_current_user),
     cover_letter: Optional[str] = Form(None),
     resume: Optional[UploadFile] = File(None),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
     ):
     if getattr(current_user, "role", "seeker") != "seeker":
         raise HTTPException(status_code=400, detail="only job seekers can apply for this job")
@@ -35,61 +40,186 @@ async def apply_to_job(
         resume_path = saved_path
         resume_filename = original_name
 
-    app = crud_app.create_application(job_id, current_user.id, cover_letter, resume_path, resume_filename, db)
+    app = await crud_app.create_application(job_id, current_user.id, cover_letter, resume_path, resume_filename, db)
 
     # fetching the job i am applying only to get the name of the job to show in email
-    job = db.query(Job).filter(Job.id == job_id).first()
+    job = await db.scalar(select(Job).where(Job.id == job_id))
 
     send_app_email.delay(current_user.email, job.title)
+    if resume_path:
+        extract_resume_text.delay(app.id)
 
     return app
 
 
 # list applications for the specific job
-@router.get('/jobs/{job_id}', response_model=list[ApplicationOut])
-def get_applications_for_job(job_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+@router.get('/jobs/{job_id}', response_model=list[ApplicationSummaryOut])
+async def get_applications_for_job(
+    job_id: int,
+    response: Response,
+    status: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=crud_app.APPLICATIONS_MAX_PAGE_SIZE),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+    ):
 
-    job = db.query(Job).filter(Job.id == job_id).first()
-    if not job:
+    owner_id = await db.scalar(select(Job.owner_id).where(Job.id == job_id))
+    if owner_id is None:
         raise HTTPException(status_code=404, detail="Job not found")
-    
-    if job.owner_id != current_user.id and getattr(current_user, 'role', None) != 'employer':
+
+    if owner_id != current_user.id:
         raise HTTPException(status_code=403, detail="You are unauthorized to view applications for this job!")
     
-    apps = crud_app.get_applications_for_job(job_id, db)
+    apps, next_cursor = await crud_app.get_applications_for_job(job_id, db, status, cursor, limit)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
 
     return apps
 
 
+# Search the applicants of a job by resume and cover letter keywords
+@router.get('/jobs/{job_id}/search', response_model=list[ApplicantSearchResult])
+async def search_applicants(
+    job_id: int,
+    q: str = Query(..., min_length=1),
+    status: Optional[str] = None,
+    skip: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1, le=crud_app.APPLICATIONS_MAX_PAGE_SIZE),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+    ):
+
+    owner_id = await db.scalar(select(Job.owner_id).where(Job.id == job_id))
+    if owner_id is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    # searches parsed resume text, only the job's owner may do that
+    if owner_id != current_user.id:
+        raise HTTPException(status_code=403, detail="You are unauthorized to view applications for this job!")
+
+    return await crud_app.search_applicants(job_id, q, db, status, skip, limit)
+
+
+# Applicants of a job, best skills match first (skip/limit page through the ranking)
+@router.get('/jobs/{job_id}/ranked', response_model=list[RankedApplicantOut])
+async def get_ranked_applications(
+    job_id: int,
+    status: Optional[str] = None,
+    skip: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1, le=crud_app.APPLICATIONS_MAX_PAGE_SIZE),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+    ):
+
+    job = await db.scalar(select(Job).where(Job.id == job_id))
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    if job.owner_id != current_user.id:
+        raise HTTPException(status_code=403, detail="You are unauthorized to view applications for this job!")
+
+    return await crud_app.get_ranked_applications(job, db, status, skip, limit)
+
+
 # list all my Job Applications
-@router.get('/me', response_model=list[ApplicationOut])
-def get_my_applications(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+@router.get('/me', response_model=list[ApplicationSummaryOut])
+async def get_my_applications(
+    response: Response,
+    status: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=crud_app.APPLICATIONS_MAX_PAGE_SIZE),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+    ):
 
-    apps = crud_app.get_applications_for_user(current_user.id, db)
+    apps, next_cursor = await crud_app.get_applications_for_user(current_user.id, db, status, cursor, limit)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
 
     return apps
 
 
+# Resume of one Application (the applicant or the job owner), supports Range and conditional requests
+@router.api_route('/{application_id}/resume', methods=["GET", "HEAD"])
+async def get_resume(application_id: int, request: Request, current_user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+
+    app = await crud_app.get_resume(application_id, db)
+    if not app:
+        raise HTTPException(status_code=404, detail="Application Not Found")
+
+    if current_user.id not in (app["user_id"], app["owner_id"]):
+        raise HTTPException(status_code=403, detail="You are unauthorized to view this application")
+
+    if not app["resume_path"]:
+        raise HTTPException(status_code=404, detail="No resume uploaded for this application")
+
+    return await media_file_response(request, resolve_media_path(app["resume_path"]), PRIVATE_CACHE_CONTROL, filename=app["resume_filename"])
+
+
+# Cover letter of one Application (the applicant or the job owner)
+@router.get('/{application_id}/cover-letter', response_model=CoverLetterOut)
+async def get_cover_letter(application_id: int, current_user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+
+    app = await crud_app.get_cover_letter(application_id, db)
+    if not app:
+        raise HTTPException(status_code=404, detail="Application Not Found")
+
+    if current_user.id not in (app["user_id"], app["owner_id"]):
+        raise HTTPException(status_code=403, detail="You are unauthorized to view this application")
+
+    return {"application_id": application_id, "cover_letter": app["cover_letter"]}
+
+
 # Update the status of Applications (Done by admin/employer)
 @router.put('/{application_id}/status', response_model=ApplicationOut)
-def update_application_status(application_id: int, new_status: ApplicationUpdateStatus, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+async def update_application_status(application_id: int, new_status: ApplicationUpdateStatus, current_user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
 
-    app = crud_app.get_application_by_id(application_id, db)
+    app = await crud_app.get_application_by_id(application_id, db)
     if not app:
         raise HTTPException(status_code=404, detail="Application Not Found")
     
-    job = db.query(Job).filter(Job.id == app.job_id).first()
+    job = await db.scalar(select(Job).where(Job.id == app.job_id))
     if job.owner_id == current_user.id and getattr(current_user, 'role', None) != "employer":
         raise HTTPException(status_code=403, detail="You are unauthorized to update this application")
     
-    allowed_status = {'applied', 'under_review', 'shortlisted', 'hired', 'rejected'}
-    if new_status.status not in allowed_status:
-        raise HTTPException(status_code=400, detail=f'invalid status, Allowed status: {allowed_status}')
+    if new_status.status not in crud_app.ALLOWED_STATUSES:
+        raise HTTPException(status_code=400, detail=f'invalid status, Allowed status: {crud_app.ALLOWED_STATUSES}')
     
-    updated_status = crud_app.update_application_status(application_id, new_status.status, db)
+    updated_status = await crud_app.update_application_status(application_id, new_status.status, db)
 
-    app_user = db.query(User).filter(User.id == app.user_id).first()
+    app_user = await db.scalar(select(User).where(User.id == app.user_id))
 
     send_app_status_email.delay(app_user.email, new_status.status)
 
-    return updated_status
\ No newline at end of file
+    return updated_status
+
+
+# Update the status of many Applications of one Job at once (Done by the job owner)
+@router.put('/jobs/{job_id}/status', response_model=ApplicationBulkStatusResult)
+async def bulk_update_application_status(job_id: int, payload: ApplicationBulkStatusUpdate, current_user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+
+    if payload.status not in crud_app.ALLOWED_STATUSES:
+        raise HTTPException(status_code=400, detail=f'invalid status, Allowed status: {crud_app.ALLOWED_STATUSES}')
+
+    owner_id = await db.scalar(select(Job.owner_id).where(Job.id == job_id))
+    if owner_id is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    if owner_id != current_user.id:
+        raise HTTPException(status_code=403, detail="You are unauthorized to update applications for this job")
+
+    changed = await crud_app.bulk_update_application_status(job_id, payload.application_ids, payload.status, db)
+
+    # one broker message per chunk of applicants instead of one per applicant
+    emails = [email for _, email in changed]
+    for start in range(0, len(emails), BULK_EMAIL_CHUNK):
+        send_bulk_app_status_email.delay(emails[start:start + BULK_EMAIL_CHUNK], payload.status)
+
+    updated = [app_id for app_id, _ in changed]
+    updated_set = set(updated)
+    return {
+        "status": payload.status,
+        "updated": updated,
+        "unchanged": [app_id for app_id in dict.fromkeys(payload.application_ids) if app_id not in updated_set],
+    }
@@ -1,7 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.requests import Request
 from authlib.integrations.starlette_client import OAuth
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.security import create_access_token
 from app.models.user import User
 from app.core.db import get_db
@@ -28,7 +29,7 @@ async def google_login(request: Request):
 
 
 @router.get('/google/callback')
-async def google_callback(request: Request, db: Session = Depends(get_db)):
+async def google_callback(request: Request, db: AsyncSession = Depends(get_db)):
 
     try:
 
@@ -43,7 +44,7 @@ async def google_callback(request: Request, db: Session = Depends(get_db)):
         if not email:
             raise HTTPException(status_code=400, detail="Google account has no email!")
         
-        user = db.query(User).filter(User.email == email).first()
+        user = await db.scalar(select(User).where(User.email == email))
         if not user:
             user = User(
                 name=name,
@@ -52,8 +53,8 @@ async def google_callback(request: Request, db: Session = Depends(get_db)):
                 email_verified=True
             )
             db.add(user)
-            db.commit()
-            db.refresh(user)
+            await db.commit()
+            await db.refresh(user)
             
         jwt_token = create_access_token({'email': user.email})
         print("Session:", request.session)
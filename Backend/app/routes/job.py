@@ -1,28 +1,50 @@
 from typing import List, Optional
-from fastapi import APIRouter, HTTPException,Depends, Query
+from fastapi import APIRouter, HTTPException,Depends, Query, Request
 from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
 from app.core.db import get_db
+from app.core.rate_limit import rate_limit_by_user
+from app.core.responses import ORJSONResponse
+from app.utils.http_cache import JOB_CACHE_CONTROL, LISTING_CACHE_CONTROL, is_not_modified, listing_etag, not_modified
 from app.models.user import User
-from app.schemas.job import JobCreate, JobOut, JobUpdate
+from app.schemas.job import JobCreate, JobFacets, JobFilters, JobImportResult, JobOut, JobRecommendation, JobUpdate
 from app.utils.functions import get_current_user
 from app.crud import job as crud_job
+from app.core.recommender import recommend_jobs
+from app.utils.bulk_import import iter_csv_records, iter_ndjson_records
 
 
 router = APIRouter(prefix="/jobs", tags=["Jobs"])
 
 # Create Job
-@router.post('/create', response_model=JobOut)
-def create(job: JobCreate, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+@router.post('/create', response_model=JobOut, dependencies=[Depends(rate_limit_by_user('create_job', settings.RATE_LIMIT_CREATE_JOB))])
+async def create(job: JobCreate, current_user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
     if getattr(current_user, "role", "seeker") not in ("employer"):
         raise HTTPException(status_code=403, detail="Only employers can create jobs")
-    return crud_job.create_job(job, current_user.id,db)
+    return await crud_job.create_job(job, current_user.id,db)
+
+# Bulk import Jobs from a streamed CSV (with header) or NDJSON request body
+@router.post('/import', response_model=JobImportResult, dependencies=[Depends(rate_limit_by_user('import_jobs', settings.RATE_LIMIT_IMPORT_JOBS))])
+async def import_jobs(request: Request, current_user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+    if getattr(current_user, "role", None) != "employer":
+        raise HTTPException(status_code=403, detail="Only employers can import jobs")
+
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type in ("text/csv", "application/csv"):
+        records = iter_csv_records(request.stream())
+    elif content_type in ("application/x-ndjson", "application/jsonl", "application/ndjson"):
+        records = iter_ndjson_records(request.stream())
+    else:
+        raise HTTPException(status_code=415, detail="Send text/csv or application/x-ndjson")
+
+    return await crud_job.import_jobs(records, current_user.id, db)
 
 # Get Jobs for employer
 @router.get("/me", response_model=List[JobOut])
-def get_my_jobs(
+async def get_my_jobs(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     if getattr(current_user, "role", None) != "employer":
         raise HTTPException(
@@ -30,41 +52,107 @@ def get_my_jobs(
             detail="Only employers can view their jobs"
         )
 
-    jobs = crud_job.get_jobs_for_employer(current_user.id, db)
+    jobs = await crud_job.get_jobs_for_employer(current_user.id, db)
     return jobs
 
+# Full-text search over active Jobs
+@router.get('/search', response_model=list[JobOut])
+async def search_jobs(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=200),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(crud_job.DEFAULT_PAGE_SIZE, ge=1, le=crud_job.MAX_PAGE_SIZE),
+    sort_by: str = Query('relevance', pattern='^(relevance|created_at|title|company)$'),
+    order: str = Query('desc', pattern='^(asc|desc)$'),
+    filters: JobFilters = Depends(),
+    db: AsyncSession = Depends(get_db),
+    ):
+    etag = await listing_etag(request)
+    if is_not_modified(request, etag):
+        return not_modified(etag, LISTING_CACHE_CONTROL)
+
+    payload = await crud_job.search_jobs(db, q, skip, limit, sort_by, order, filters)
+    return ORJSONResponse(payload.body, headers={"ETag": etag, "Cache-Control": LISTING_CACHE_CONTROL})
+
+# Active Jobs matching the current user's skills, best match first
+@router.get('/recommended', response_model=list[JobRecommendation])
+async def get_recommended_jobs(
+    limit: int = Query(crud_job.DEFAULT_PAGE_SIZE, ge=1, le=crud_job.MAX_PAGE_SIZE),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    ):
+    return await recommend_jobs(current_user, db, limit)
+
+# Facet counts (location, employment type, salary band) for the filter sidebar
+@router.get('/facets', response_model=JobFacets)
+async def get_job_facets(request: Request, filters: JobFilters = Depends(), db: AsyncSession = Depends(get_db)):
+    etag = await listing_etag(request)
+    if is_not_modified(request, etag):
+        return not_modified(etag, LISTING_CACHE_CONTROL)
+
+    payload = await crud_job.get_job_facets(db, filters)
+    return ORJSONResponse(payload.body, headers={"ETag": etag, "Cache-Control": LISTING_CACHE_CONTROL})
+
 # Get single Job by id
 @router.get('/{job_id}', response_model=JobOut)
-def get_job_by_id(job_id:int, db: Session = Depends(get_db)):
-    job = crud_job.get_job_by_id(job_id, db)
-    if not job:
+async def get_job_by_id(job_id:int, request: Request, db: AsyncSession = Depends(get_db)):
+    # served from the detail cache, so a revalidation does not reach the database either
+    payload = await crud_job.get_job_detail(job_id, db)
+    if not payload:
         raise HTTPException(status_code=404, detail="Job not found")
-    
-    return job
+
+    etag = payload.meta.get("etag")
+    if etag is None:
+        return ORJSONResponse(payload.body)
+    if is_not_modified(request, etag):
+        return not_modified(etag, JOB_CACHE_CONTROL)
+
+    return ORJSONResponse(payload.body, headers={"ETag": etag, "Cache-Control": JOB_CACHE_CONTROL})
 
 # Get all Jobs
+# Pages by `cursor` (next one is sent back in the X-Next-Cursor header),
+# `skip` keeps the old offset paging working.
+# The cached JSON body is sent as is, response_model only documents its shape.
+# ETag follows the jobs cache generation, a current client gets a 304.
 @router.get('/',response_model=list[JobOut])
-def get_all_jobs(
-    db: Session = Depends(get_db),
-    skip: Optional[int] = None,
-    limit: Optional[int] = None,
+async def get_all_jobs(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    skip: Optional[int] = Query(None, ge=0),
+    limit: Optional[int] = Query(None, ge=1),
+    cursor: Optional[str] = None,
     q: Optional[str] = None,
     sort_by: Optional[str] = None,
     order: Optional[str] = None,
+    filters: JobFilters = Depends(),
     ):
-    return crud_job.get_jobs(db,skip, limit, q, sort_by, order)
+    etag = await listing_etag(request)
+    if is_not_modified(request, etag):
+        return not_modified(etag, LISTING_CACHE_CONTROL)
+    headers = {"ETag": etag, "Cache-Control": LISTING_CACHE_CONTROL}
+
+    if skip is not None and cursor is None:
+        payload = await crud_job.get_jobs(db,skip, limit, q, sort_by, order, filters)
+        return ORJSONResponse(payload.body, headers=headers)
+
+    page, next_cursor = await crud_job.get_jobs_page(db, cursor, limit, q, sort_by, order, filters)
+    response = ORJSONResponse(page.body, headers=headers)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+
+    return response
 
 
 
 # Update Job
 @router.put('/update/{job_id}', response_model=JobOut)
-def update(updated_job: JobUpdate, job_id:int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    return crud_job.update_job(updated_job, job_id,current_user.id,db)
+async def update(updated_job: JobUpdate, job_id:int, current_user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+    return await crud_job.update_job(updated_job, job_id,current_user.id,db)
 
 # Delete a job
 @router.delete('/{job_id}')
-def delete_job(job_id:int, db: Session = Depends(get_db)):
-    job = crud_job.delete_job(job_id,db)
+async def delete_job(job_id:int, db: AsyncSession = Depends(get_db)):
+    job = await crud_job.delete_job(job_id,db)
     if not job:
         raise HTTPException(status_code=400, detail="Job with that id not found")
     
@@ -0,0 +1,17 @@
+from fastapi import APIRouter, Request
+from app.utils.media import media_file_response, resolve_media_path
+
+
+# Public uploads (avatars and company logos). Resumes are not served here,
+# they go through /applications/{application_id}/resume which checks access.
+router = APIRouter(prefix="/media", tags=["Media"])
+
+
+@router.api_route('/avatars/{filename}', methods=["GET", "HEAD"])
+async def get_avatar(filename: str, request: Request):
+    return await media_file_response(request, resolve_media_path(f"avatars/{filename}"))
+
+
+@router.api_route('/logos/{filename}', methods=["GET", "HEAD"])
+async def get_logo(filename: str, request: Request):
+    return await media_file_response(request, resolve_media_path(f"logos/{filename}"))
@@ -0,0 +1,53 @@
+import os
+from fastapi import APIRouter, Depends, HTTPException
+from app.core.cache import cache_stats
+from app.core.recommender import job_index, ranking_cache, recommendation_cache
+from app.core.db import async_engine, engine
+from app.core.db_metrics import pool_status, query_stats
+from app.models.user import User, UserRole
+from app.utils.functions import get_current_user
+
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+
+async def require_admin(current_user: User = Depends(get_current_user)):
+    if getattr(current_user, "role", None) != UserRole.ADMIN.value:
+        raise HTTPException(status_code=403, detail="Only admins can view metrics")
+    return current_user
+
+
+# Cache counters (job listings, job details, principals) of the worker that serves this request
+@router.get('/cache')
+async def get_cache_stats(current_user: User = Depends(require_admin)):
+    counters = {name: cache_stats[name] for name in ("hit", "miss", "stale", "early_refresh", "lock_wait", "lock_timeout")}
+    lookups = counters["hit"] + counters["miss"] + counters["stale"] + counters["early_refresh"]
+    return {
+        "worker_pid": os.getpid(),
+        **counters,
+        "hit_ratio": round((counters["hit"] + counters["stale"]) / lookups, 4) if lookups else None,
+        "recommendations": {
+            "indexed_jobs": len(job_index),
+            "vocabulary": len(job_index.vocabulary),
+            "cached_users": len(recommendation_cache),
+            **{name: recommendation_cache.stats[name] for name in ("hit", "miss", "evicted")},
+        },
+        "applicant_rankings": {
+            "cached": len(ranking_cache),
+            "bytes": ranking_cache.current_bytes,
+            **{name: ranking_cache.stats[name] for name in ("hit", "miss", "evicted")},
+        },
+    }
+
+
+# Query latency, slow queries and connection pool state of this worker
+@router.get('/db')
+async def get_db_stats(top: int = 10, current_user: User = Depends(require_admin)):
+    return {
+        "worker_pid": os.getpid(),
+        "pools": {
+            "async": pool_status(async_engine.sync_engine),
+            "sync": pool_status(engine),
+        },
+        **query_stats.snapshot(top),
+    }
@@ -1,6 +1,6 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.db import get_db
 from app.models.user import User
 from app.utils.functions import get_current_user
@@ -10,18 +10,20 @@ from app.schemas.saved_job import SavedJobOut
 router = APIRouter(prefix="/saved-jobs", tags=["Saved Jobs"])
 
 @router.post("/{job_id}")
-def toggle_save(
+async def toggle_save(
     job_id: int, 
-    db: Session = Depends(get_db), 
+    db: AsyncSession = Depends(get_db), 
     current_user: User = Depends(get_current_user)
 ):
     if current_user.role != "seeker":
         raise HTTPException(status_code=403, detail="Only seekers can save jobs")
-    return crud_saved.toggle_save_job(db, current_user.id, job_id)
+    return await crud_saved.toggle_save_job(db, current_user.id, job_id)
 
 @router.get("/", response_model=List[SavedJobOut])
-def get_my_saved_jobs(
-    db: Session = Depends(get_db), 
+async def get_my_saved_jobs(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(crud_saved.SAVED_JOBS_PAGE_SIZE, ge=1, le=crud_saved.SAVED_JOBS_MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_db), 
     current_user: User = Depends(get_current_user)
 ):
-    return crud_saved.get_saved_jobs_for_user(db, current_user.id)
\ No newline at end of file
+    return await crud_saved.get_saved_jobs_for_user(db, current_user.id, skip, limit)
\ No newline at end of file
@@ -1,5 +1,5 @@
 # schemas/application.py
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
 from typing import Optional
 
@@ -20,5 +20,35 @@ class ApplicationOut(BaseModel):
     class Config:
         orm_mode = True
 
+# Listing shape: the cover letter is fetched separately via /applications/{id}/cover-letter
+class ApplicationSummaryOut(BaseModel):
+    id: int
+    job_id: int
+    user_id: int
+    resume_path: Optional[str] = None
+    resume_filename: Optional[str] = None
+    status: str
+    created_at: datetime
+    has_cover_letter: bool
+
+class ApplicantSearchResult(ApplicationSummaryOut):
+    rank: Optional[float] = None  # full-text relevance, None on databases without full-text search
+
+class RankedApplicantOut(ApplicationSummaryOut):
+    score: float  # cosine similarity of the applicant's skills/experience to the job, 0..1
+
+class CoverLetterOut(BaseModel):
+    application_id: int
+    cover_letter: Optional[str] = None
+
 class ApplicationUpdateStatus(BaseModel):
     status: str  # validate in endpoint (allowed statuses)
+
+class ApplicationBulkStatusUpdate(BaseModel):
+    application_ids: list[int] = Field(..., min_length=1, max_length=1000)
+    status: str  # validate in endpoint (allowed statuses)
+
+class ApplicationBulkStatusResult(BaseModel):
+    status: str
+    updated: list[int]
+    unchanged: list[int]  # ids not on this job, or already in this status
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional
 from datetime import datetime
 
@@ -36,4 +36,42 @@ class JobOut(JobBase):
     updated_at: Optional[datetime] = None
 
     class Config:
-        orm_mode = True
\ No newline at end of file
+        orm_mode = True
+
+
+class JobRecommendation(JobOut):
+    score: float  # cosine similarity between the seeker's skills and the job text
+
+
+# Structured filters shared by the listing and search endpoints (query params)
+class JobFilters(BaseModel):
+    location: Optional[str] = None
+    employment_type: Optional[str] = None
+    company: Optional[str] = None
+    salary_min: Optional[int] = Field(None, ge=0)  # job pays at least this much
+    salary_max: Optional[int] = Field(None, ge=0)  # job starts at or below this
+    posted_since: Optional[datetime] = None
+
+class FacetCount(BaseModel):
+    value: str
+    count: int
+
+class SalaryBandCount(BaseModel):
+    min: int
+    max: Optional[int] = None
+    count: int
+
+class JobFacets(BaseModel):
+    locations: list[FacetCount]
+    employment_types: list[FacetCount]
+    salary_bands: list[SalaryBandCount]
+
+class JobImportError(BaseModel):
+    row: int
+    errors: list[str]
+
+class JobImportResult(BaseModel):
+    imported: int
+    failed: int
+    errors: list[JobImportError]
+    errors_truncated: bool = False
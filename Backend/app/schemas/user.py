@@ -1,6 +1,6 @@
 from pydantic import BaseModel, HttpUrl
 from pydantic import EmailStr
-from typing import Any, List, Optional
+from typing import Any, Dict, List, Optional
 
 
 class UserBase(BaseModel):
@@ -36,11 +36,13 @@ class UserOut(UserBase):
     skills: Optional[List[str]] = None
     experience: Optional[List[Any]] = None
     avatar_url: Optional[str] = None  # full URL/path served by static route
+    avatar_urls: Optional[Dict[str, str]] = None  # resized variants by pixel size, once generated
     # employer fields
     company_name: Optional[str] = None
     company_website: Optional[str] = None
     company_description: Optional[str] = None
     logo_url: Optional[str] = None
+    logo_urls: Optional[Dict[str, str]] = None
     
 
     class config:
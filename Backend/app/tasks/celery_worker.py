@@ -1,4 +1,5 @@
 from celery import Celery
+from celery.signals import worker_process_init
 
 celery_app = Celery(
     'worker',
@@ -8,6 +9,15 @@ celery_app = Celery(
 
 celery_app.conf.timezone = "Asia/Karachi"
 
+
+# compile the email templates once per worker process instead of on the first send
+@worker_process_init.connect
+def warm_email_templates(**kwargs):
+    from app.core.email_templates import warm_templates
+    warm_templates()
+
 from app.utils import send_email
 from app.utils import send_app_email
-from app.utils import send_app_status_email
\ No newline at end of file
+from app.utils import send_app_status_email
+from app.utils import image_variants
+from app.utils import resume_text
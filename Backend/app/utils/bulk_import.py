@@ -0,0 +1,76 @@
+import codecs
+import csv
+import json
+from typing import AsyncIterator, Union
+
+
+# Each record is (row_number, fields) or (row_number, error message) when the
+# row could not even be parsed. Row numbers count data rows from 1.
+Record = tuple[int, Union[dict, str]]
+
+
+async def _iter_lines(stream: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Decode a byte stream into text lines without buffering the whole body."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for chunk in stream:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.rstrip("\r")
+
+
+async def iter_ndjson_records(stream: AsyncIterator[bytes]) -> AsyncIterator[Record]:
+    row = 0
+    async for line in _iter_lines(stream):
+        if not line.strip():
+            continue
+        row += 1
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield row, f"Invalid JSON: {e.msg}"
+            continue
+        if not isinstance(record, dict):
+            yield row, "Each line must be a JSON object"
+            continue
+        yield row, record
+
+
+async def iter_csv_records(stream: AsyncIterator[bytes]) -> AsyncIterator[Record]:
+    """
+    CSV with a header row. Quoted fields may contain newlines, so physical lines
+    are joined until the quotes of a record balance out.
+    """
+    header = None
+    row = 0
+    record_lines: list[str] = []
+
+    async for line in _iter_lines(stream):
+        record_lines.append(line)
+        text = "\n".join(record_lines)
+        if text.count('"') % 2:
+            continue  # inside a quoted field
+        record_lines = []
+
+        if not text.strip():
+            continue
+        values = next(csv.reader([text]))
+
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+
+        row += 1
+        if len(values) != len(header):
+            yield row, f"Expected {len(header)} columns, got {len(values)}"
+            continue
+        # empty cells mean "not set", not empty strings
+        yield row, {name: (value if value != "" else None) for name, value in zip(header, values)}
+
+    if record_lines:
+        yield row + 1, "Unterminated quoted field"
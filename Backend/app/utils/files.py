@@ -1,7 +1,12 @@
+import codecs
 import os 
 import uuid
 from pathlib import Path
+import aiofiles
+import aiofiles.os
 from fastapi import UploadFile, HTTPException
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers
 
 
 MEDIA_ROOT = Path("media")
@@ -16,12 +21,40 @@ for d in (AVATAR_DIR, LOGO_DIR, RESUME_DIR):
 ALLOWED_DOC_EXT = {".pdf", ".doc", ".docx", ".txt"}
 ALLOWED_IMAGE_EXT = {".png", ".jpg", ".jpeg", ".webp"}
 MAX_FILE_SIZE = 8 * 1024 * 1024  # 8MB
+CHUNK_SIZE = 64 * 1024
+# Whole multipart request: one file plus the form fields (cover letter) and boundaries
+MAX_MULTIPART_BODY = MAX_FILE_SIZE + 1024 * 1024
+
+# Leading bytes each extension must start with, checked on the first chunk
+MAGIC_BYTES = {
+    ".pdf": (b"%PDF-",),
+    ".docx": (b"PK\x03\x04",),
+    ".doc": (b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1",),
+    ".png": (b"\x89PNG\r\n\x1a\n",),
+    ".jpg": (b"\xff\xd8\xff",),
+    ".jpeg": (b"\xff\xd8\xff",),
+}
+
+
+def _content_matches_extension(ext: str, head: bytes) -> bool:
+    if ext == ".webp":
+        return head[:4] == b"RIFF" and head[8:12] == b"WEBP"
+    if ext == ".txt":
+        # plain text: no NUL bytes and valid UTF-8 (the chunk may end mid character)
+        try:
+            codecs.getincrementaldecoder("utf-8")().decode(head, final=False)
+        except UnicodeDecodeError:
+            return False
+        return b"\x00" not in head
+    return head.startswith(MAGIC_BYTES[ext])
 
 
 async def _save_upload_file(file: UploadFile, dest_dir: Path, allowed_exts: set) -> tuple[str, str]:
     """
-    Save UploadFile to local MEDIA_ROOT/resumes, return (saved_path, original_filename)
+    Stream UploadFile into dest_dir in chunks, return (saved_path, original_filename)
     saved_path is a relative path string (e.g., 'media/resumes/<uuid>.pdf')
+    The upload is written to a temporary file next to the destination and renamed
+    into place once complete, so readers never see a partial file.
     """
 
     if not file:
@@ -33,17 +66,36 @@ async def _save_upload_file(file: UploadFile, dest_dir: Path, allowed_exts: set)
 
     if ext not in allowed_exts:
         raise HTTPException(status_code=400, detail=f"Unsupported file extension {ext}")
-    
-    # Read file to check bytes
-    content = await file.read()
-    if len(content) > MAX_FILE_SIZE:
-        raise HTTPException(status_code=413, detail=f"File too large {len(content)} - Limit is {MAX_FILE_SIZE}")
+
+    # the multipart parser may already know the size
+    if file.size is not None and file.size > MAX_FILE_SIZE:
+        raise HTTPException(status_code=413, detail=f"File too large {file.size} - Limit is {MAX_FILE_SIZE}")
     
     unique_name = f'{uuid.uuid4().hex}{ext}'
     save_path = dest_dir / unique_name
+    temp_path = dest_dir / f'.{unique_name}.part'
+
+    written = 0
+    try:
+        async with aiofiles.open(temp_path, "wb") as out:
+            while chunk := await file.read(CHUNK_SIZE):
+                if written == 0 and not _content_matches_extension(ext, chunk):
+                    raise HTTPException(status_code=400, detail=f"File content does not match extension {ext}")
+
+                written += len(chunk)
+                if written > MAX_FILE_SIZE:
+                    raise HTTPException(status_code=413, detail=f"File too large - Limit is {MAX_FILE_SIZE}")
+
+                await out.write(chunk)
 
-    with open(save_path, "wb") as f:
-        f.write(content)
+        if written == 0:
+            raise HTTPException(status_code=400, detail="Uploaded file is empty")
+
+        await aiofiles.os.replace(temp_path, save_path)
+    except BaseException:
+        if await aiofiles.os.path.exists(temp_path):
+            await aiofiles.os.remove(temp_path)
+        raise
 
     return str(save_path), filename.name
 
@@ -59,3 +111,44 @@ async def save_avatar_file(file: UploadFile) -> tuple[str, str]:
 async def save_logo_file(file: UploadFile) -> tuple[str, str]:
     return await _save_upload_file(file,LOGO_DIR,ALLOWED_IMAGE_EXT)
 
+
+
+class UploadSizeLimitMiddleware:
+    """
+    Cap multipart request bodies before they are parsed. Starlette spools the
+    whole body to a temp file before the route runs, so the per-file check in
+    _save_upload_file alone would only fire after an oversized upload arrived.
+    A declared Content-Length over the cap is refused straight away, a chunked
+    body is cut off with a 413 as soon as it passes the cap.
+    """
+
+    def __init__(self, app, max_body_size: int = MAX_MULTIPART_BODY):
+        self.app = app
+        self.max_body_size = max_body_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        headers = Headers(scope=scope)
+        if not headers.get("content-type", "").lower().startswith("multipart/form-data"):
+            return await self.app(scope, receive, send)
+
+        content_length = headers.get("content-length", "")
+        if content_length.isdigit() and int(content_length) > self.max_body_size:
+            response = JSONResponse({"detail": f"Request too large - Limit is {self.max_body_size}"}, status_code=413)
+            return await response(scope, receive, send)
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body_size:
+                    # raised inside form parsing, FastAPI passes HTTPExceptions through as they are
+                    raise HTTPException(status_code=413, detail=f"Request too large - Limit is {self.max_body_size}")
+            return message
+
+        await self.app(scope, limited_receive, send)
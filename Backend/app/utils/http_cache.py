@@ -0,0 +1,42 @@
+import hashlib
+from urllib.parse import urlencode
+
+from fastapi import Request, Response
+
+from app.core.cache import get_jobs_generation
+
+# Anonymous job reads: browsers always revalidate (a 304 when nothing changed), shared
+# caches in front of the API (CDN, reverse proxy) serve a copy for s-maxage seconds and
+# may keep serving it while they revalidate in the background
+LISTING_CACHE_CONTROL = "public, max-age=0, s-maxage=30, stale-while-revalidate=30"
+JOB_CACHE_CONTROL = "public, max-age=0, s-maxage=60, stale-while-revalidate=60"
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # weak comparison, as required for If-None-Match
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    return if_none_match is not None and etag_matches(if_none_match, etag)
+
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    # a 304 repeats the validator and caching headers but carries no body
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+
+
+async def listing_etag(request: Request) -> str:
+    """
+    ETag of a job listing response: the jobs cache generation (bumped by every job
+    write) plus the normalised path and query. Needs neither the database nor the
+    cached page, so a current client gets its 304 straight away.
+    """
+    generation = await get_jobs_generation()
+    query = urlencode(sorted(request.query_params.multi_items()))
+    digest = hashlib.sha1(f"{request.url.path}?{query}".encode()).hexdigest()[:16]
+    return f'"jobs-{generation}-{digest}"'
@@ -0,0 +1,85 @@
+import logging
+import os
+from pathlib import Path
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+from sqlalchemy import select
+
+from app.tasks.celery_worker import celery_app
+from app.core.cache import invalidate_key_sync
+from app.core.db import SessionLocal
+from app.crud.user import principal_cache_key
+from app.models.user import User
+
+logger = logging.getLogger("app.images")
+
+# Pixel sizes of the generated variants (longest side, avatars are also cropped square)
+VARIANT_SIZES = (64, 128, 512)
+WEBP_QUALITY = 80
+# Refuse to decode anything larger than this, an 8MB upload can still claim huge dimensions
+MAX_SOURCE_PIXELS = 40_000_000
+
+IMAGE_KINDS = {
+    # kind: (path column, variants column, crop to square)
+    "avatar": ("avatar_path", "avatar_variants", True),
+    "logo": ("logo_path", "logo_variants", False),
+}
+
+
+def _variant_path(source: Path, size: int) -> Path:
+    return source.with_name(f"{source.stem}_{size}.webp")
+
+
+def _load(source: Path) -> Image.Image:
+    image = Image.open(source)
+    if image.width * image.height > MAX_SOURCE_PIXELS:
+        raise ValueError(f"{image.width}x{image.height} image is too large")
+
+    # JPEGs can be decoded at 1/2, 1/4 or 1/8 scale, which is much cheaper when we only need 512px
+    image.draft("RGB", (max(VARIANT_SIZES), max(VARIANT_SIZES)))
+    image = ImageOps.exif_transpose(image)
+    return image.convert("RGBA" if image.mode in ("RGBA", "LA", "P") else "RGB")
+
+
+def make_variants(source: Path, crop_square: bool) -> dict[str, str]:
+    """Write one WebP per size next to `source`, returns {size: relative path}."""
+    image = _load(source)
+    if crop_square:
+        side = min(image.size)
+        image = ImageOps.fit(image, (side, side))
+
+    variants = {}
+    # largest first, so each smaller size is resampled from the previous one instead of the original
+    for size in sorted(VARIANT_SIZES, reverse=True):
+        image.thumbnail((size, size), Image.Resampling.LANCZOS)
+        dest = _variant_path(source, size)
+        tmp = dest.with_name(f".{dest.name}.part")
+        image.save(tmp, "WEBP", quality=WEBP_QUALITY, method=4)
+        os.replace(tmp, dest)
+        variants[str(size)] = dest.as_posix()
+    return variants
+
+
+@celery_app.task
+def generate_image_variants(user_id: int, kind: str, source_path: str):
+    path_column, variants_column, crop_square = IMAGE_KINDS[kind]
+
+    try:
+        variants = make_variants(Path(source_path), crop_square)
+    except (OSError, UnidentifiedImageError, ValueError, Image.DecompressionBombError) as e:
+        logger.warning("No %s variants for user %s (%s): %s", kind, user_id, source_path, e)
+        return
+
+    with SessionLocal() as db:
+        user = db.scalar(select(User).where(User.id == user_id))
+        # the user may have uploaded another image while this one was processing
+        if not user or getattr(user, path_column) != source_path:
+            for path in variants.values():
+                Path(path).unlink(missing_ok=True)
+            return
+
+        setattr(user, variants_column, variants)
+        db.commit()
+        email = user.email
+
+    invalidate_key_sync(principal_cache_key(email))
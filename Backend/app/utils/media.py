@@ -0,0 +1,99 @@
+import os
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Optional
+
+import anyio
+from fastapi import HTTPException, Request, Response
+from fastapi.responses import FileResponse
+
+from app.utils.files import MEDIA_ROOT
+from app.utils.http_cache import etag_matches
+
+# Uploaded files are stored under a fresh uuid name and never rewritten, so a URL
+# always points at the same bytes and browsers/CDNs can keep it for a year
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# Same for access-controlled files, but only in the requesting user's browser
+PRIVATE_CACHE_CONTROL = "private, max-age=86400, immutable"
+
+
+def resolve_media_path(relative_path: str) -> Path:
+    """
+    Map a stored path such as 'media/resumes/<uuid>.pdf' (or 'resumes/<uuid>.pdf')
+    to a file under MEDIA_ROOT. Anything that escapes MEDIA_ROOT is a 404.
+    """
+    root = MEDIA_ROOT.resolve()
+    parts = Path(relative_path.replace("\\", "/")).parts
+    if parts and parts[0] == MEDIA_ROOT.name:
+        parts = parts[1:]
+
+    path = root.joinpath(*parts).resolve() if parts else root
+    if root not in path.parents:
+        raise HTTPException(status_code=404, detail="File not found")
+    return path
+
+
+def _not_modified(request: Request, etag: str, mtime: float) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-None-Match wins over If-Modified-Since when both are sent
+        return etag_matches(if_none_match, etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return int(mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+async def media_file_response(request: Request, path: Path, cache_control: str = IMMUTABLE_CACHE_CONTROL,
+                              filename: Optional[str] = None, content_disposition_type: str = "inline") -> Response:
+    """
+    Serve a file with validators and range support:
+      - ETag/Last-Modified on every response, 304 when the client copy is current
+      - Range/If-Range handled by FileResponse (206, or 416 when unsatisfiable)
+      - the body goes out via http.response.pathsend (zero copy) where the server supports it
+    """
+    try:
+        stat_result = await anyio.to_thread.run_sync(os.stat, path)
+    except (FileNotFoundError, NotADirectoryError):
+        raise HTTPException(status_code=404, detail="File not found")
+    if not os.path.isfile(path):
+        raise HTTPException(status_code=404, detail="File not found")
+
+    response = FileResponse(path, stat_result=stat_result, filename=filename,
+                            content_disposition_type=content_disposition_type,
+                            headers={"Cache-Control": cache_control})
+
+    if _not_modified(request, response.headers["etag"], stat_result.st_mtime):
+        # a 304 repeats the validators and caching headers but carries no body
+        headers = {name: response.headers[name] for name in ("etag", "last-modified", "cache-control")}
+        return Response(status_code=304, headers=headers)
+
+    return response
+
+
+def media_url(path: Optional[str]) -> Optional[str]:
+    return "/" + path.replace("\\", "/") if path else None
+
+
+# Variant used for the single avatar_url/logo_url field in each context
+PROFILE_IMAGE_SIZE = "512"
+LIST_IMAGE_SIZE = "128"
+
+
+def attach_media_urls(user, size: str = PROFILE_IMAGE_SIZE):
+    """
+    Set avatar_url/logo_url (the `size` variant, or the original until variants
+    exist) and avatar_urls/logo_urls (every variant) on a User for UserOut.
+    """
+    if user is None:
+        return None
+    for kind in ("avatar", "logo"):
+        variants = getattr(user, f"{kind}_variants", None) or {}
+        urls = {variant_size: media_url(path) for variant_size, path in variants.items()}
+        setattr(user, f"{kind}_urls", urls or None)
+        setattr(user, f"{kind}_url", urls.get(size) or media_url(getattr(user, f"{kind}_path", None)))
+    return user
@@ -0,0 +1,40 @@
+import base64
+import json
+from typing import Callable, TypeVar
+
+from fastapi import HTTPException
+from sqlalchemy import DateTime, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+T = TypeVar("T")
+
+# SQLite keeps DATETIME as text: CURRENT_TIMESTAMP writes '2026-01-01 12:00:41' while a bound
+# datetime becomes '2026-01-01 12:00:41.000000', so the same instant compares as smaller and a
+# keyset cursor would return its own row again. Compare both sides in one normalised format.
+SQLITE_DATETIME_FORMAT = '%Y-%m-%d %H:%M:%f'
+
+
+def encode_cursor(position: dict) -> str:
+    """Opaque, URL safe cursor for a keyset position."""
+    raw = json.dumps(position)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, parse: Callable[[dict], T]) -> T:
+    """
+    Decode a cursor from encode_cursor and turn its position into keyset values
+    with `parse`. The cursor is opaque to clients, so anything that does not
+    decode, or that `parse` rejects, is a 400.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return parse(json.loads(base64.urlsafe_b64decode(padded.encode())))
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def keyset_row(db: AsyncSession, column, value) -> tuple:
+    """(column, value) ready for a keyset tuple comparison on this database."""
+    if db.get_bind().dialect.name == "sqlite" and isinstance(column.type, DateTime):
+        return func.strftime(SQLITE_DATETIME_FORMAT, column), func.strftime(SQLITE_DATETIME_FORMAT, value)
+    return column, value
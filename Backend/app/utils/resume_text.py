@@ -0,0 +1,74 @@
+import logging
+from pathlib import Path
+
+from docx import Document
+from pypdf import PdfReader
+from sqlalchemy import select, update
+
+from app.tasks.celery_worker import celery_app
+from app.core.db import SessionLocal
+from app.models.application import Application
+
+logger = logging.getLogger("app.resumes")
+
+# Enough for any real resume; keeps a crafted file from producing a huge tsvector
+MAX_PDF_PAGES = 20
+MAX_TEXT_CHARS = 200_000
+
+
+def _pdf_text(path: Path) -> str:
+    reader = PdfReader(path)
+    return "\n".join(page.extract_text() or "" for page in reader.pages[:MAX_PDF_PAGES])
+
+
+def _docx_text(path: Path) -> str:
+    document = Document(path)
+    parts = [paragraph.text for paragraph in document.paragraphs]
+    for table in document.tables:
+        for row in table.rows:
+            parts.extend(cell.text for cell in row.cells)
+    return "\n".join(parts)
+
+
+def _txt_text(path: Path) -> str:
+    with open(path, "rb") as f:
+        return f.read(MAX_TEXT_CHARS * 4).decode("utf-8", errors="replace")
+
+
+# Legacy .doc is accepted on upload but has no extractor, those resumes are just not searchable
+EXTRACTORS = {
+    ".pdf": _pdf_text,
+    ".docx": _docx_text,
+    ".txt": _txt_text,
+}
+
+
+def extract_text(path: Path) -> str | None:
+    extractor = EXTRACTORS.get(path.suffix.lower())
+    if extractor is None:
+        return None
+    text = extractor(path)
+    # Postgres text cannot hold NUL, and runs of whitespace only bloat the column
+    text = " ".join(text.replace("\x00", " ").split())
+    return text[:MAX_TEXT_CHARS]
+
+
+@celery_app.task
+def extract_resume_text(application_id: int):
+    with SessionLocal() as db:
+        resume_path = db.scalar(select(Application.resume_path).where(Application.id == application_id))
+        if not resume_path:
+            return
+
+        try:
+            text = extract_text(Path(resume_path))
+        except Exception as e:
+            # parsers raise all sorts of errors on malformed files, a bad resume must not retry forever
+            logger.warning("Could not extract text from %s (application %s): %s", resume_path, application_id, e)
+            return
+
+        if text is None:
+            return
+
+        db.execute(update(Application).where(Application.id == application_id).values(resume_text=text))
+        db.commit()
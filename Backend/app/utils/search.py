@@ -0,0 +1,17 @@
+import re
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def supports_full_text(db: AsyncSession) -> bool:
+    # the tsvector columns and their GIN indexes only exist on Postgres
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def build_prefix_tsquery(q: str) -> Optional[str]:
+    # "python dev" -> "python:* & dev:*" so partially typed words still match
+    terms = re.findall(r"\w+", q.lower())
+    if not terms:
+        return None
+    return " & ".join(f"{term}:*" for term in terms)
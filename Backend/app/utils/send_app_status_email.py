@@ -1,33 +1,20 @@
 from app.tasks.celery_worker import celery_app
-from sendgrid import SendGridAPIClient
-from sendgrid.helpers.mail import Mail
-from app.core.config import settings
+from app.core.email_templates import render_email
+from app.core.mailer import MAX_BATCH_SIZE, Recipient, get_mailer
+
+# Recipients per Celery message; the mailer splits further into provider batches
+BULK_EMAIL_CHUNK = MAX_BATCH_SIZE
 
 @celery_app.task
 def send_app_status_email(to_email: str,status: str):
     # link = f'http://localhost:8000/auth/confirm?token={token}'
-    html_content = f"""
-    <html>
-    <body style="font-family: Arial, sans-serif; background-color: #f4f4f4; padding: 20px;">
-        <div style="max-width: 600px; margin: auto; background: white; padding: 20px; border-radius: 10px;">
-        <h2 style="color: #333;">Welcome to MyApp!</h2>
-        <p style="color: #555;">Current status for your application is {status}</p>
-        </div>
-    </body>
-    </html>
-    """
-
-    message = Mail(
-        from_email=settings.MAIL_FROM,
-        to_emails=to_email,
-        subject='Job Application Status',
-        html_content=html_content
+    email = render_email('application_status', status=status)
+    get_mailer().send(email.subject, email.html, [Recipient(to_email)], text_content=email.text)
 
-    )
 
-    try:
-        sendgrid = SendGridAPIClient(settings.SENDGRID_API_KEY)
-        response = sendgrid.send(message)
-        print(f'Email sent to {to_email}, Status: {response.status_code}')
-    except Exception as e:
-        print(f'SendGrid error: {e}')
\ No newline at end of file
+# One task per chunk of applicants, sent as batched requests with one
+# personalization per recipient, so applicants don't see each other.
+@celery_app.task
+def send_bulk_app_status_email(to_emails: list[str], status: str):
+    email = render_email('application_status', status=status)
+    get_mailer().send(email.subject, email.html, [Recipient(address) for address in to_emails], text_content=email.text)
@@ -0,0 +1,66 @@
+"""
+Throughput of the email dispatch pipeline, offline.
+
+Sends one message to `--recipients` addresses through the Mailer using the
+memory (or file) transport and reports recipients per second and provider
+requests made. `--rate` enables the token bucket, in requests per second, to
+check pacing; `--fail-every` makes every Nth request fail once to exercise the
+retry path.
+
+    cd Backend
+    python -m benchmarks.bench_email_dispatch --recipients 20000 --batch-size 1000
+    python -m benchmarks.bench_email_dispatch --recipients 2000 --batch-size 100 --rate 5
+"""
+import argparse
+import time
+
+from app.core.mailer import FileTransport, Mailer, MemoryTransport, Recipient, TokenBucket, TransientEmailError
+
+
+class FlakyTransport:
+    """Wraps a transport and fails every Nth request once with a retryable error."""
+
+    def __init__(self, transport, fail_every: int):
+        self.transport = transport
+        self.fail_every = fail_every
+        self.requests = 0
+        self.failures = 0
+
+    def send(self, batch):
+        self.requests += 1
+        if self.fail_every and self.requests % self.fail_every == 0:
+            self.failures += 1
+            raise TransientEmailError("simulated 429")
+        self.transport.send(batch)
+
+    def close(self):
+        self.transport.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--recipients", type=int, default=10000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--rate", type=float, default=0, help="requests per second, 0 disables the token bucket")
+    parser.add_argument("--burst", type=float, default=1)
+    parser.add_argument("--fail-every", type=int, default=0)
+    parser.add_argument("--file", help="write batches to this file instead of keeping them in memory")
+    args = parser.parse_args()
+
+    transport = FlakyTransport(FileTransport(args.file) if args.file else MemoryTransport(), args.fail_every)
+    rate_limiter = TokenBucket(args.rate, args.burst) if args.rate > 0 else None
+    mailer = Mailer(transport, batch_size=args.batch_size, rate_limiter=rate_limiter, backoff_base=0.01)
+
+    recipients = [Recipient(f"user{i}@example.com", {"name": f"User {i}"}) for i in range(args.recipients)]
+    html = "<p>Hello -name-, your application status changed.</p>"
+
+    started = time.perf_counter()
+    sent = mailer.send("Job Application Status", html, recipients)
+    elapsed = time.perf_counter() - started
+
+    print(f"{sent} recipients in {elapsed:.3f}s: {sent / elapsed:.0f} recipients/s")
+    print(f"{transport.requests} requests ({transport.failures} retried), batch size {mailer.batch_size}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Login throughput of the Argon2 process pool.
+
+Verifies one password hash `--logins` times with `--concurrency` logins in
+flight, the way /auth/login does, and reports logins per second and per core.
+
+    cd Backend
+    python -m benchmarks.bench_login_hashing --logins 200 --concurrency 16
+
+Uses the ARGON2_* and PASSWORD_HASH_* settings from Backend/.env, override them
+with environment variables to compare cost parameters or pool sizes.
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from app.core import security
+from app.core.config import settings
+
+
+async def run(logins: int, concurrency: int) -> float:
+    password = "correct horse battery staple"
+    hashed = security.hash_password(password)
+    in_flight = asyncio.Semaphore(concurrency)
+
+    async def login():
+        async with in_flight:
+            verified, _ = await security.verify_and_update_password(password, hashed)
+            assert verified
+
+    # warm up the worker processes before timing
+    await asyncio.gather(*(login() for _ in range(settings.PASSWORD_HASH_WORKERS)))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=settings.PASSWORD_HASH_MAX_CONCURRENCY)
+    args = parser.parse_args()
+
+    elapsed = asyncio.run(run(args.logins, args.concurrency))
+    security.shutdown_hash_pool()
+
+    cores = min(settings.PASSWORD_HASH_WORKERS, os.cpu_count() or 1)
+    per_second = args.logins / elapsed
+    print(
+        f"argon2 t={settings.ARGON2_TIME_COST} m={settings.ARGON2_MEMORY_COST}KiB p={settings.ARGON2_PARALLELISM}, "
+        f"{settings.PASSWORD_HASH_WORKERS} workers"
+    )
+    print(f"{args.logins} logins in {elapsed:.2f}s: {per_second:.1f} logins/s, {per_second / cores:.1f} logins/s per core")
+
+
+if __name__ == "__main__":
+    main()
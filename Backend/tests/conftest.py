@@ -0,0 +1,107 @@
+"""
+Test setup: a throwaway SQLite database, an in-memory Redis (fakeredis) shared by
+the sync and async clients, and Celery tasks that are recorded instead of queued.
+Everything is patched before `app` is imported, because the engines and Redis
+clients are created at import time.
+"""
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import fakeredis
+import pytest
+import redis
+import redis.asyncio
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+_db_dir = tempfile.mkdtemp(prefix="jobboard-tests-")
+# uploads go to ./media, keep them out of the source tree
+os.chdir(_db_dir)
+os.environ.update(
+    DATABASE_URL=f"sqlite:///{_db_dir}/test.db",
+    JWT_SECRET_KEY="test-secret",
+    REDIS_URL="redis://localhost:6379",
+    SENDGRID_API_KEY="test",
+    MAIL_FROM="noreply@example.com",
+    GOOGLE_CLIENT_ID="test",
+    GOOGLE_CLIENT_SECRET="test",
+    GOOGLE_REDIRECT_URI="http://localhost/auth/google/callback",
+    SESSION_SECRET="test-session",
+    EMAIL_TRANSPORT="memory",
+    # cheap hashes, the tests register a lot of users
+    ARGON2_TIME_COST="1",
+    ARGON2_MEMORY_COST="1024",
+    ARGON2_PARALLELISM="1",
+)
+
+_redis_server = fakeredis.FakeServer()
+redis.Redis = lambda *args, **kwargs: fakeredis.FakeRedis(
+    server=_redis_server, decode_responses=kwargs.get("decode_responses", False))
+redis.asyncio.Redis = lambda *args, **kwargs: fakeredis.FakeAsyncRedis(
+    server=_redis_server, decode_responses=kwargs.get("decode_responses", False))
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+import app.main  # noqa: E402
+from app.core import cache  # noqa: E402
+from app.core.db import Base, SessionLocal, engine  # noqa: E402
+from app.core.local_cache import local_cache  # noqa: E402
+from app.core.recommender import ranking_cache, recommendation_cache  # noqa: E402
+from app.tasks.celery_worker import celery_app  # noqa: E402
+
+queued_tasks = []
+
+for _name, _task in list(celery_app.tasks.items()):
+    if _name.startswith("app."):
+        _task.delay = lambda *args, _name=_name, **kwargs: queued_tasks.append((_name, args, kwargs))
+
+
+@pytest.fixture(autouse=True)
+def clean_state():
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    fakeredis.FakeRedis(server=_redis_server).flushall()
+    for tier in (local_cache, ranking_cache, recommendation_cache):
+        tier.clear()
+    cache._local_generation.update(value=None, synced_at=0.0)
+    queued_tasks.clear()
+    yield
+
+
+@pytest.fixture(name="queued_tasks")
+def queued_tasks_fixture():
+    """Celery tasks sent during the test, as (task name, args, kwargs)."""
+    return queued_tasks
+
+
+@pytest.fixture
+def client():
+    with TestClient(app.main.app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def run(client):
+    """Run a coroutine function on the app's event loop, where the async Redis client lives."""
+    return lambda fn, *args: client.portal.call(fn, *args)
+
+
+@pytest.fixture
+def db():
+    with SessionLocal() as session:
+        yield session
+
+
+@pytest.fixture
+def make_user(client):
+    """Register and log in a user, returns their Authorization headers."""
+    def make(email: str, role: str = "seeker") -> dict:
+        response = client.post("/users/register", json={"name": "Test", "email": email, "password": "secret", "role": role})
+        assert response.status_code == 200, response.text
+        response = client.post("/auth/login", data={"username": email, "password": "secret"})
+        assert response.status_code == 200, response.text
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+    return make
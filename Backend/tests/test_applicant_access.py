@@ -0,0 +1,56 @@
+import pytest
+
+
+@pytest.fixture
+def job_with_applicant(client, make_user):
+    owner = make_user("owner@example.com", "employer")
+    job_id = client.post("/jobs/create", json={"title": "Python developer", "description": "Django"}, headers=owner).json()["id"]
+    seeker = make_user("seeker@example.com")
+    client.post(f"/applications/jobs/{job_id}/apply", data={"cover_letter": "Python and Django"}, headers=seeker)
+    return job_id, owner, seeker
+
+
+def test_search_is_owner_only(client, make_user, job_with_applicant):
+    job_id, owner, seeker = job_with_applicant
+    other_employer = make_user("other@example.com", "employer")
+    url = f"/applications/jobs/{job_id}/search"
+
+    assert client.get(url, params={"q": "python"}, headers=owner).status_code == 200
+    assert client.get(url, params={"q": "python"}, headers=other_employer).status_code == 403
+    assert client.get(url, params={"q": "python"}, headers=seeker).status_code == 403
+    assert client.get("/applications/jobs/999/search", params={"q": "python"}, headers=owner).status_code == 404
+
+
+def test_ranking_is_owner_only(client, make_user, job_with_applicant):
+    job_id, owner, seeker = job_with_applicant
+    other_employer = make_user("other@example.com", "employer")
+    url = f"/applications/jobs/{job_id}/ranked"
+
+    assert client.get(url, headers=owner).status_code == 200
+    assert client.get(url, headers=other_employer).status_code == 403
+    assert client.get(url, headers=seeker).status_code == 403
+    assert client.get("/applications/jobs/999/ranked", headers=owner).status_code == 404
+
+
+def test_ranking_orders_by_skills_match(client, make_user):
+    owner = make_user("owner@example.com", "employer")
+    job_id = client.post("/jobs/create", json={"title": "Python developer", "description": "Django and Redis"}, headers=owner).json()["id"]
+    for email, skills in (("excel@example.com", ["Excel"]), ("python@example.com", ["Python", "Django"])):
+        seeker = make_user(email)
+        client.put("/users/me/update", json={"skills": skills}, headers=seeker)
+        client.post(f"/applications/jobs/{job_id}/apply", headers=seeker)
+
+    ranked = client.get(f"/applications/jobs/{job_id}/ranked", headers=owner).json()
+    assert [application["id"] for application in ranked] == [2, 1]
+    assert ranked[0]["score"] > ranked[1]["score"] == 0
+
+
+def test_listing_is_owner_only(client, make_user, job_with_applicant):
+    job_id, owner, seeker = job_with_applicant
+    other_employer = make_user("other@example.com", "employer")
+    url = f"/applications/jobs/{job_id}"
+
+    assert client.get(url, headers=owner).status_code == 200
+    assert client.get(url, headers=other_employer).status_code == 403
+    assert client.get(url, headers=seeker).status_code == 403
+    assert client.get("/applications/jobs/999", headers=owner).status_code == 404
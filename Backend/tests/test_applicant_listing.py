@@ -0,0 +1,42 @@
+from datetime import datetime
+
+from sqlalchemy import update
+
+from app.models.application import Application
+
+
+def apply_many(client, make_user, count):
+    employer = make_user("employer@example.com", "employer")
+    job_id = client.post("/jobs/create", json={"title": "T", "description": "d"}, headers=employer).json()["id"]
+    for i in range(count):
+        seeker = make_user(f"seeker{i}@example.com")
+        assert client.post(f"/applications/jobs/{job_id}/apply", data={"cover_letter": "hi"}, headers=seeker).status_code == 200
+    return employer, job_id
+
+
+def collect_pages(client, url, headers, limit):
+    seen, cursor = [], None
+    for _ in range(20):
+        response = client.get(url, params={"limit": limit, **({"cursor": cursor} if cursor else {})}, headers=headers)
+        assert response.status_code == 200
+        seen += [application["id"] for application in response.json()]
+        cursor = response.headers.get("x-next-cursor")
+        if not cursor:
+            return seen
+    raise AssertionError(f"pagination did not finish, saw {seen}")
+
+
+def test_applicants_page_through_tied_timestamps(client, make_user, db):
+    employer, job_id = apply_many(client, make_user, 5)
+    db.execute(update(Application).values(created_at=datetime(2026, 1, 1, 12, 0, 41)))
+    db.commit()
+
+    assert collect_pages(client, f"/applications/jobs/{job_id}", employer, 2) == [5, 4, 3, 2, 1]
+
+
+def test_applicant_listing_is_projected(client, make_user):
+    employer, job_id = apply_many(client, make_user, 1)
+    application = client.get(f"/applications/jobs/{job_id}", headers=employer).json()[0]
+
+    assert application["has_cover_letter"] is True
+    assert "cover_letter" not in application
@@ -0,0 +1,17 @@
+import redis
+
+from app.core.redis_client import async_redis_client, async_redis_raw_client
+
+
+def test_authentication_works_without_redis(client, make_user, monkeypatch):
+    headers = make_user("user@example.com")
+
+    async def unavailable(*args, **kwargs):
+        raise redis.ConnectionError("Redis is down")
+
+    for redis_client in (async_redis_client, async_redis_raw_client):
+        monkeypatch.setattr(redis_client, "execute_command", unavailable)
+
+    response = client.get("/auth/check-token", headers=headers)
+    assert response.status_code == 200
+    assert response.json() == {"message": "user@example.com"}
@@ -0,0 +1,52 @@
+import pytest
+
+from app.utils.send_app_status_email import send_bulk_app_status_email
+
+
+@pytest.fixture
+def applications(client, make_user):
+    """Jobs of two employers with two applicants each: (owner, job_id, its application ids, other, other_job_id, its ids)."""
+    owner = make_user("owner@example.com", "employer")
+    other = make_user("other@example.com", "employer")
+    job_id = client.post("/jobs/create", json={"title": "T", "description": "d"}, headers=owner).json()["id"]
+    other_job_id = client.post("/jobs/create", json={"title": "T", "description": "d"}, headers=other).json()["id"]
+
+    ids = {job_id: [], other_job_id: []}
+    for i in range(2):
+        seeker = make_user(f"seeker{i}@example.com")
+        for applied_to in ids:
+            ids[applied_to].append(client.post(f"/applications/jobs/{applied_to}/apply", headers=seeker).json()["id"])
+    return owner, job_id, ids[job_id], other, other_job_id, ids[other_job_id]
+
+
+def test_bulk_status_reports_changed_and_unchanged(client, applications, queued_tasks):
+    owner, job_id, own_ids, _, _, foreign_ids = applications
+    queued_tasks.clear()
+
+    response = client.put(f"/applications/jobs/{job_id}/status",
+                          json={"application_ids": [own_ids[0], foreign_ids[0], 999], "status": "shortlisted"}, headers=owner)
+    assert response.status_code == 200
+    assert response.json() == {"status": "shortlisted", "updated": [own_ids[0]], "unchanged": [foreign_ids[0], 999]}
+    # only the applicant whose status changed is emailed
+    assert queued_tasks == [(send_bulk_app_status_email.name, (["seeker0@example.com"], "shortlisted"), {})]
+
+    response = client.put(f"/applications/jobs/{job_id}/status",
+                          json={"application_ids": own_ids, "status": "shortlisted"}, headers=owner)
+    assert response.json() == {"status": "shortlisted", "updated": [own_ids[1]], "unchanged": [own_ids[0]]}
+
+
+def test_bulk_status_leaves_other_jobs_alone(client, applications):
+    owner, job_id, _, other, other_job_id, foreign_ids = applications
+    client.put(f"/applications/jobs/{job_id}/status", json={"application_ids": foreign_ids, "status": "rejected"}, headers=owner)
+
+    listing = client.get(f"/applications/jobs/{other_job_id}", headers=other).json()
+    assert {application["status"] for application in listing} == {"applied"}
+
+
+def test_bulk_status_is_owner_only(client, applications):
+    _, job_id, own_ids, other, _, _ = applications
+    payload = {"application_ids": own_ids, "status": "hired"}
+
+    assert client.put(f"/applications/jobs/{job_id}/status", json=payload, headers=other).status_code == 403
+    assert client.put("/applications/jobs/999/status", json=payload, headers=other).status_code == 404
+    assert client.put(f"/applications/jobs/{job_id}/status", json={**payload, "status": "unknown"}, headers=other).status_code == 400
@@ -0,0 +1,40 @@
+def create_job(client, headers, title="Python developer"):
+    return client.post("/jobs/create", json={"title": title, "description": "d"}, headers=headers).json()["id"]
+
+
+def test_listing_revalidates_with_etag(client, make_user):
+    employer = make_user("employer@example.com", "employer")
+    create_job(client, employer)
+
+    response = client.get("/jobs/")
+    etag = response.headers["etag"]
+    assert response.headers["cache-control"].startswith("public")
+
+    response = client.get("/jobs/", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert response.content == b""
+
+    # another query is another representation
+    assert client.get("/jobs/", params={"q": "python"}, headers={"If-None-Match": etag}).status_code == 200
+
+    create_job(client, employer, "Second")
+    response = client.get("/jobs/", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert len(response.json()) == 2
+
+
+def test_job_detail_revalidates_with_etag(client, make_user):
+    employer = make_user("employer@example.com", "employer")
+    job_id = create_job(client, employer)
+
+    etag = client.get(f"/jobs/{job_id}").headers["etag"]
+    assert client.get(f"/jobs/{job_id}", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get(f"/jobs/{job_id}", headers={"If-None-Match": f'W/{etag}, "other"'}).status_code == 304
+
+    client.put(f"/jobs/update/{job_id}", json={"title": "Renamed"}, headers=employer)
+    response = client.get(f"/jobs/{job_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert response.json()["title"] == "Renamed"
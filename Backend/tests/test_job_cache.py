@@ -0,0 +1,97 @@
+import asyncio
+
+from app.core import cache
+from app.core.cache import cache_stats, get_or_compute, invalidate_jobs_cache, invalidate_key, jobs_cache_key
+from app.core.local_cache import local_cache
+from app.core.redis_client import async_redis_client
+
+
+def test_listing_follows_job_writes(client, make_user):
+    employer = make_user("employer@example.com", "employer")
+    first = client.post("/jobs/create", json={"title": "First", "description": "d"}, headers=employer).json()["id"]
+    assert [job["id"] for job in client.get("/jobs/", params={"skip": 0}).json()] == [first]
+
+    second = client.post("/jobs/create", json={"title": "Second", "description": "d"}, headers=employer).json()["id"]
+    assert [job["id"] for job in client.get("/jobs/", params={"skip": 0}).json()] == [second, first]
+
+    client.put(f"/jobs/update/{first}", json={"title": "Renamed"}, headers=employer)
+    assert [job["title"] for job in client.get("/jobs/", params={"skip": 0}).json()] == ["Second", "Renamed"]
+
+    client.delete(f"/jobs/{second}", headers=employer)
+    assert [job["id"] for job in client.get("/jobs/", params={"skip": 0}).json()] == [first]
+
+
+def test_job_detail_follows_updates(client, make_user):
+    employer = make_user("employer@example.com", "employer")
+    job_id = client.post("/jobs/create", json={"title": "Before", "description": "d"}, headers=employer).json()["id"]
+    assert client.get(f"/jobs/{job_id}").json()["title"] == "Before"
+
+    client.put(f"/jobs/update/{job_id}", json={"title": "After"}, headers=employer)
+    assert client.get(f"/jobs/{job_id}").json()["title"] == "After"
+
+    client.delete(f"/jobs/{job_id}", headers=employer)
+    assert client.get(f"/jobs/{job_id}").status_code == 404
+
+
+def test_get_or_compute_caches_until_generation_moves(run):
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        return {"n": len(calls)}
+
+    async def read():
+        return await get_or_compute(await jobs_cache_key("test"), compute)
+
+    assert run(read) == {"n": 1}
+    assert run(read) == {"n": 1}
+    assert len(calls) == 1
+
+    run(invalidate_jobs_cache)
+    assert run(read) == {"n": 2}
+
+
+def test_invalidate_key_drops_both_tiers(run):
+    async def compute():
+        return "value"
+
+    run(get_or_compute, "principal:someone", compute)
+    assert local_cache.get("principal:someone") is not None
+
+    run(invalidate_key, "principal:someone")
+    assert local_cache.get("principal:someone") is None
+    misses = cache_stats["miss"]
+    run(get_or_compute, "principal:someone", compute)
+    assert cache_stats["miss"] == misses + 1
+
+
+def test_import_clears_cached_job_not_found(client, make_user):
+    employer = make_user("employer@example.com", "employer")
+    assert client.get("/jobs/1").status_code == 404
+
+    body = "title,description\nImported,d\n"
+    result = client.post("/jobs/import", content=body, headers={**employer, "Content-Type": "text/csv"}).json()
+    assert result["imported"] == 1
+
+    assert client.get("/jobs/1").json()["title"] == "Imported"
+
+
+def test_listener_survives_malformed_messages(run):
+    async def wait_for(condition):
+        for _ in range(100):
+            if condition():
+                return True
+            await asyncio.sleep(0.01)
+        return False
+
+    async def scenario():
+        assert await wait_for(cache._listener_alive.is_set)
+        local_cache.set("job:1", "cached", 10)
+        for garbage in ("not json", '{"op": "delete"}'):
+            await async_redis_client.publish(cache.INVALIDATION_CHANNEL, garbage)
+        # sent by another worker, so only the listener can drop the local copy
+        await async_redis_client.publish(cache.INVALIDATION_CHANNEL, '{"op": "delete", "keys": ["job:1"]}')
+        assert await wait_for(lambda: local_cache.get("job:1") is None)
+        assert cache._listener_alive.is_set()
+
+    run(scenario)
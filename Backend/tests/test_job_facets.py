@@ -0,0 +1,30 @@
+def create_job(client, headers, **fields):
+    return client.post("/jobs/create", json={"title": "T", "description": "d", **fields}, headers=headers)
+
+
+def test_facets_follow_new_jobs(client, make_user):
+    employer = make_user("employer@example.com", "employer")
+    create_job(client, employer, location="Berlin", employment_type="full_time", salary_min=60_000, salary_max=80_000)
+    create_job(client, employer, location="Berlin", employment_type="contract", salary_min=120_000)
+
+    facets = client.get("/jobs/facets").json()
+    assert facets["locations"] == [{"value": "Berlin", "count": 2}]
+    assert facets["employment_types"] == [{"value": "contract", "count": 1}, {"value": "full_time", "count": 1}]
+    assert [band["count"] for band in facets["salary_bands"]] == [0, 1, 1, 0, 0]
+
+    create_job(client, employer, location="Paris", employment_type="full_time", salary_max=40_000)
+
+    facets = client.get("/jobs/facets").json()
+    assert facets["locations"] == [{"value": "Berlin", "count": 2}, {"value": "Paris", "count": 1}]
+    assert facets["employment_types"] == [{"value": "full_time", "count": 2}, {"value": "contract", "count": 1}]
+    assert [band["count"] for band in facets["salary_bands"]] == [1, 1, 1, 0, 0]
+
+
+def test_facets_apply_filters(client, make_user):
+    employer = make_user("employer@example.com", "employer")
+    create_job(client, employer, location="Berlin", employment_type="full_time")
+    create_job(client, employer, location="Paris", employment_type="contract")
+
+    facets = client.get("/jobs/facets", params={"location": "Paris"}).json()
+    assert facets["locations"] == [{"value": "Paris", "count": 1}]
+    assert facets["employment_types"] == [{"value": "contract", "count": 1}]
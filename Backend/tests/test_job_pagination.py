@@ -0,0 +1,62 @@
+from datetime import datetime
+
+from sqlalchemy import update
+
+from app.models.job import Job
+
+
+def create_jobs(client, headers, count):
+    return [
+        client.post("/jobs/create", json={"title": f"Job {i}", "description": "Python"}, headers=headers).json()["id"]
+        for i in range(count)
+    ]
+
+
+def collect_pages(client, params, max_pages=20):
+    seen, cursor = [], None
+    for _ in range(max_pages):
+        response = client.get("/jobs/", params={**params, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200
+        seen += [job["id"] for job in response.json()]
+        cursor = response.headers.get("x-next-cursor")
+        if not cursor:
+            return seen
+    raise AssertionError(f"pagination did not finish, saw {seen}")
+
+
+def test_cursor_pages_cover_every_job_once(client, make_user):
+    employer = make_user("employer@example.com", "employer")
+    ids = create_jobs(client, employer, 5)
+
+    assert collect_pages(client, {"limit": 2}) == sorted(ids, reverse=True)
+
+
+def test_cursor_pages_through_tied_timestamps(client, make_user, db):
+    employer = make_user("employer@example.com", "employer")
+    ids = create_jobs(client, employer, 5)
+    db.execute(update(Job).values(created_at=datetime(2026, 1, 1, 12, 0, 41)))
+    db.commit()
+
+    # ties on created_at are broken by id
+    assert collect_pages(client, {"limit": 2}) == sorted(ids, reverse=True)
+    assert collect_pages(client, {"limit": 2, "order": "asc"}) == sorted(ids)
+
+
+def test_cursor_pages_by_title(client, make_user):
+    employer = make_user("employer@example.com", "employer")
+    create_jobs(client, employer, 5)
+
+    seen = collect_pages(client, {"limit": 2, "sort_by": "title", "order": "asc"})
+    assert len(seen) == len(set(seen)) == 5
+
+
+def test_invalid_cursor_is_rejected(client):
+    assert client.get("/jobs/", params={"cursor": "not-a-cursor"}).status_code == 400
+
+
+def test_cursor_from_another_sort_is_rejected(client, make_user):
+    employer = make_user("employer@example.com", "employer")
+    create_jobs(client, employer, 3)
+    cursor = client.get("/jobs/", params={"limit": 1}).headers["x-next-cursor"]
+
+    assert client.get("/jobs/", params={"cursor": cursor, "sort_by": "title"}).status_code == 400
@@ -0,0 +1,70 @@
+import pytest
+import redis
+from fastapi import HTTPException
+
+from app.core import rate_limit
+from app.core.config import settings
+
+
+def login(client, email="user@example.com"):
+    return client.post("/auth/login", data={"username": email, "password": "secret"})
+
+
+def test_parse_rate():
+    assert rate_limit.parse_rate("10/minute") == (10, 60)
+    assert rate_limit.parse_rate("5/Hour") == (5, 3600)
+    with pytest.raises(ValueError):
+        rate_limit.parse_rate("ten per minute")
+
+
+def test_login_is_limited_per_ip(client, make_user):
+    make_user("user@example.com")
+    count, period = rate_limit.parse_rate(settings.RATE_LIMIT_LOGIN)
+
+    # make_user already spent one token
+    statuses = [login(client).status_code for _ in range(count)]
+    assert statuses[:count - 1] == [200] * (count - 1)
+    assert statuses[-1] == 429
+
+    response = login(client)
+    assert response.status_code == 429
+    assert 1 <= int(response.headers["retry-after"]) <= period // count + 1
+
+
+def test_job_import_is_limited(client, make_user):
+    employer = make_user("employer@example.com", "employer")
+    count, _ = rate_limit.parse_rate(settings.RATE_LIMIT_IMPORT_JOBS)
+    body = "title,description\nPython developer,Django\n"
+    headers = {**employer, "Content-Type": "text/csv"}
+
+    statuses = [client.post("/jobs/import", content=body, headers=headers).status_code for _ in range(count + 1)]
+    assert statuses == [200] * count + [429]
+
+
+def test_limiter_fails_open_when_redis_is_down(client, make_user, monkeypatch):
+    make_user("user@example.com")
+
+    async def unavailable(*args, **kwargs):
+        raise redis.ConnectionError("Redis is down")
+
+    monkeypatch.setattr(rate_limit, "_take_token", unavailable)
+    count, _ = rate_limit.parse_rate(settings.RATE_LIMIT_LOGIN)
+    assert {login(client).status_code for _ in range(count + 2)} == {200}
+
+
+def test_limiter_can_be_disabled(client, make_user, monkeypatch):
+    make_user("user@example.com")
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", False)
+    count, _ = rate_limit.parse_rate(settings.RATE_LIMIT_LOGIN)
+    assert {login(client).status_code for _ in range(count + 2)} == {200}
+
+
+def test_buckets_are_per_scope_and_identity(run):
+    async def spend(identity):
+        await rate_limit.hit("test", identity, 1, 60)
+
+    run(spend, "a")
+    run(spend, "b")
+    with pytest.raises(HTTPException) as excinfo:
+        run(spend, "a")
+    assert excinfo.value.status_code == 429
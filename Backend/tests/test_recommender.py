@@ -0,0 +1,32 @@
+from collections import Counter
+
+from app.core.recommender import JobIndex, skill_terms
+
+
+def test_score_ranks_matching_jobs_first():
+    index = JobIndex()
+    index.upsert(1, "Python Developer", "Django and PostgreSQL")
+    index.upsert(2, "Accountant", "Excel and bookkeeping")
+    index.upsert(3, "Data Scientist", "Python and pandas")
+    index.rebuild_matrix()
+
+    ranked = index.score(skill_terms(["Python", "Django"]), limit=10)
+    assert [job_id for job_id, _ in ranked] == [1, 3]
+    assert index.score(Counter({"unknown": 1}), limit=10) == []
+
+
+def test_rebuild_publishes_a_new_snapshot_in_one_step():
+    index = JobIndex()
+    index.upsert(1, "Python Developer", "Django")
+    index.rebuild_matrix()
+    before = index._snapshot
+
+    index.upsert(2, "Rust Developer", "Systems programming with many new terms")
+    index.rebuild_matrix()
+
+    # a reader that took the old snapshot keeps a consistent (ids, matrix, idf) triple
+    job_ids, matrix, idf = before
+    assert index._snapshot is not before
+    assert matrix.shape == (len(job_ids), len(idf)) == (1, len(idf))
+    new_ids, new_matrix, new_idf = index._snapshot
+    assert new_matrix.shape == (len(new_ids), len(new_idf)) == (2, len(index.vocabulary))
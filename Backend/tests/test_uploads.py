@@ -0,0 +1,40 @@
+from app.utils.files import MAX_MULTIPART_BODY
+
+
+def create_job(client, make_user):
+    employer = make_user("employer@example.com", "employer")
+    return client.post("/jobs/create", json={"title": "T", "description": "d"}, headers=employer).json()["id"]
+
+
+def test_oversized_upload_is_refused_before_parsing(client, make_user):
+    job_id = create_job(client, make_user)
+    seeker = make_user("seeker@example.com")
+    resume = b"%PDF-1.4 " + b"x" * MAX_MULTIPART_BODY
+
+    response = client.post(f"/applications/jobs/{job_id}/apply", files={"resume": ("cv.pdf", resume, "application/pdf")}, headers=seeker)
+    assert response.status_code == 413
+
+
+def test_chunked_upload_is_cut_off(client, make_user):
+    job_id = create_job(client, make_user)
+    seeker = make_user("seeker@example.com")
+    boundary = "testboundary"
+    head = (f'--{boundary}\r\nContent-Disposition: form-data; name="resume"; filename="cv.pdf"\r\n'
+            'Content-Type: application/pdf\r\n\r\n%PDF-1.4 ').encode()
+
+    def body():
+        yield head
+        for _ in range(MAX_MULTIPART_BODY // (1024 * 1024) + 2):
+            yield b"x" * (1024 * 1024)
+
+    response = client.post(f"/applications/jobs/{job_id}/apply", content=body(),
+                           headers={**seeker, "Content-Type": f"multipart/form-data; boundary={boundary}"})
+    assert response.status_code == 413
+
+
+def test_small_upload_is_accepted(client, make_user):
+    job_id = create_job(client, make_user)
+    seeker = make_user("seeker@example.com")
+
+    response = client.post(f"/applications/jobs/{job_id}/apply", files={"resume": ("cv.txt", b"Python developer", "text/plain")}, headers=seeker)
+    assert response.status_code == 200
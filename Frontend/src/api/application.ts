@@ -34,14 +34,31 @@ export const applyToJob = async (jobId: number, coverLetter: string, resumeFile:
     return response.data;
 }
 
+export interface ApplicationsPage<T = Application> {
+  items: T[]
+  nextCursor: string | null
+}
+
+// Listings are paged by cursor, the next one comes back in the X-Next-Cursor header
+const getApplicationsPage = async <T = Application>(url: string, cursor?: string | null): Promise<ApplicationsPage<T>> => {
+    const response = await api.get(url, { params: cursor ? { cursor } : {} })
+    return { items: response.data, nextCursor: response.headers["x-next-cursor"] ?? null }
+}
+
+// A seeker's own applications are few, so this follows the cursor to the end
 export const getMyApplications = async (): Promise<Application[]> => {
-    const response = await api.get('/applications/me')
-    return response.data
+    const applications: Application[] = []
+    let cursor: string | null = null
+    do {
+        const page: ApplicationsPage = await getApplicationsPage('/applications/me', cursor)
+        applications.push(...page.items)
+        cursor = page.nextCursor
+    } while (cursor)
+    return applications
 }
 
-export const getApplicationsForJob = async(jobId: number) => {
-    const response = await api.get(`/applications/jobs/${jobId}`)
-    return response.data
+export const getApplicationsForJob = async <T = Application>(jobId: number, cursor?: string | null) => {
+    return getApplicationsPage<T>(`/applications/jobs/${jobId}`, cursor)
 }
 
 export const updateApplicationStatus = async (
@@ -53,4 +70,14 @@ export const updateApplicationStatus = async (
     payload
   )
   return res.data
-}
\ No newline at end of file
+}
+export const getCoverLetter = async (applicationId: number): Promise<string | null> => {
+  const res = await api.get(`/applications/${applicationId}/cover-letter`)
+  return res.data.cover_letter
+}
+
+// Resumes are access controlled, so they are fetched with the auth header rather than linked directly
+export const getResume = async (applicationId: number): Promise<Blob> => {
+  const res = await api.get(`/applications/${applicationId}/resume`, { responseType: 'blob' })
+  return res.data
+}
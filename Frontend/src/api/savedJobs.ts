@@ -1,11 +1,21 @@
 import api from "./axios";
 
+// Largest page the API serves (SAVED_JOBS_MAX_PAGE_SIZE)
+const SAVED_JOBS_PAGE_SIZE = 500;
+
 export const toggleSaveJob = async (jobId: number) => {
   const res = await api.post(`/saved-jobs/${jobId}`);
   return res.data; // Returns { "status": "saved" } or { "status": "unsaved" }
 };
 
+// The listing is paged, keep reading until a short page marks the end
 export const getMySavedJobs = async () => {
-  const res = await api.get("/saved-jobs/");
-  return res.data;
-};
\ No newline at end of file
+  const savedJobs: any[] = [];
+  for (let skip = 0; ; skip += SAVED_JOBS_PAGE_SIZE) {
+    const res = await api.get("/saved-jobs/", { params: { skip, limit: SAVED_JOBS_PAGE_SIZE } });
+    savedJobs.push(...res.data);
+    if (res.data.length < SAVED_JOBS_PAGE_SIZE) {
+      return savedJobs;
+    }
+  }
+};
@@ -1,7 +1,10 @@
-import { useQuery, useMutation, useQueryClient } from "@tanstack/react-query";
+import { useState } from "react";
+import { useInfiniteQuery, useQuery, useMutation, useQueryClient } from "@tanstack/react-query";
 import { useParams, useNavigate } from "react-router-dom";
 import { 
   getApplicationsForJob, 
+  getCoverLetter,
+  getResume,
   updateApplicationStatus, 
   type Application, 
   type UpdateApplicationStatusPayload 
@@ -32,7 +35,7 @@ const STATUS_OPTIONS = [
 ] as const;
 
 type JobApplication = Application & {
-  cover_letter?: string | null;
+  has_cover_letter?: boolean;
   resume_path?: string | null;
   resume_filename?: string | null;
 };
@@ -45,6 +48,40 @@ const statusStyles: Record<(typeof STATUS_OPTIONS)[number], string> = {
   rejected: "bg-red-500",
 };
 
+// The applicants list doesn't include cover letters; each one is fetched when opened
+const CoverLetter = ({ applicationId }: { applicationId: number }) => {
+  const [open, setOpen] = useState(false);
+  const { data, isLoading } = useQuery({
+    queryKey: ["cover-letter", applicationId],
+    queryFn: () => getCoverLetter(applicationId),
+    enabled: open,
+  });
+
+  if (!open) {
+    return (
+      <Button variant="outline" className="rounded-xl font-bold gap-2 w-fit" onClick={() => setOpen(true)}>
+        <FileText size={14} /> Show Cover Letter
+      </Button>
+    );
+  }
+
+  return (
+    <div className="relative bg-slate-50/50 rounded-2xl p-6 border border-slate-100">
+      <Quote className="absolute top-4 right-4 text-slate-200" size={40} />
+      <h3 className="text-xs font-black uppercase tracking-widest text-blue-600 mb-3 flex items-center gap-2">
+        <FileText size={14} /> Cover Letter
+      </h3>
+      {isLoading ? (
+        <Loader2 className="animate-spin text-blue-600" size={18} />
+      ) : (
+        <p className="text-slate-600 text-sm leading-relaxed font-medium whitespace-pre-wrap break-words relative z-10">
+          {data}
+        </p>
+      )}
+    </div>
+  );
+};
+
 const JobApplicants = () => {
   const { jobId } = useParams();
   const navigate = useNavigate();
@@ -59,66 +96,70 @@ const JobApplicants = () => {
     },
   });
 
-  const { data, isLoading, isError } = useQuery<JobApplication[]>({
+  // one page per request, "Load more" follows the cursor the API sends back
+  const {
+    data: pages,
+    isLoading,
+    isError,
+    fetchNextPage,
+    hasNextPage,
+    isFetchingNextPage,
+  } = useInfiniteQuery({
     queryKey: ["job-applicants", jobId],
-    queryFn: () => getApplicationsForJob(Number(jobId)),
+    queryFn: ({ pageParam }) => getApplicationsForJob<JobApplication>(Number(jobId), pageParam),
+    initialPageParam: null as string | null,
+    getNextPageParam: (lastPage) => lastPage.nextCursor,
     enabled: !!jobId,
   });
+  const data = pages?.pages.flatMap((page) => page.items);
 
-  const getResumeUrl = (resumePath: string) => {
-    const apiBaseUrl = String(import.meta.env.VITE_API_BASE_URL || "").replace(/\/$/, "");
-    const normalizedPath = String(resumePath).replace(/^\/+/, "");
-    return apiBaseUrl ? `${apiBaseUrl}/${normalizedPath}` : normalizedPath;
+  const fetchResume = async (applicationId: number) => {
+    try {
+      return URL.createObjectURL(await getResume(applicationId));
+    } catch {
+      toast.error("Couldn't load the resume.");
+      return null;
+    }
   };
 
-  const handleOpenResume = (resumePath: string | null | undefined) => {
-    if (!resumePath) {
+  const handleOpenResume = async (app: JobApplication) => {
+    if (!app.resume_path) {
       toast.error("No resume uploaded for this applicant.");
       return;
     }
 
-    const resumeUrl = getResumeUrl(resumePath);
-    const newTab = window.open(resumeUrl, "_blank", "noopener,noreferrer");
-    if (!newTab) {
-      const link = document.createElement("a");
-      link.href = resumeUrl;
-      link.target = "_blank";
-      link.rel = "noopener noreferrer";
-      document.body.appendChild(link);
-      link.click();
-      document.body.removeChild(link);
+    // open the tab right away so the popup blocker sees the click, then point it at the file
+    const newTab = window.open("", "_blank");
+    const objectUrl = await fetchResume(app.id);
+    if (!objectUrl) {
+      newTab?.close();
+      return;
     }
+    if (newTab) {
+      newTab.location.href = objectUrl;
+    } else {
+      window.location.assign(objectUrl);
+    }
+    setTimeout(() => URL.revokeObjectURL(objectUrl), 60_000);
   };
 
-  const handleDownloadResume = async (
-    resumePath: string | null | undefined,
-    fileName: string
-  ) => {
-    if (!resumePath) {
+  const handleDownloadResume = async (app: JobApplication, fileName: string) => {
+    if (!app.resume_path) {
       toast.error("No resume uploaded for this applicant.");
       return;
     }
 
-    const resumeUrl = getResumeUrl(resumePath);
-
-    try {
-      const res = await fetch(resumeUrl);
-      if (!res.ok) throw new Error(`Download failed: ${res.status}`);
-      const blob = await res.blob();
+    const objectUrl = await fetchResume(app.id);
+    if (!objectUrl) return;
 
-      const objectUrl = URL.createObjectURL(blob);
-      const link = document.createElement("a");
-      link.href = objectUrl;
-      link.download = fileName || "resume.pdf";
-      document.body.appendChild(link);
-      link.click();
-      document.body.removeChild(link);
-      URL.revokeObjectURL(objectUrl);
-      toast.info("Downloading Resume...");
-    } catch {
-      toast.info("Opening resume (use the browser download button).");
-      handleOpenResume(resumePath);
-    }
+    const link = document.createElement("a");
+    link.href = objectUrl;
+    link.download = fileName || "resume.pdf";
+    document.body.appendChild(link);
+    link.click();
+    document.body.removeChild(link);
+    URL.revokeObjectURL(objectUrl);
+    toast.info("Downloading Resume...");
   };
 
   if (isLoading) return <div className="min-h-[60vh] flex items-center justify-center"><Loader2 className="animate-spin text-blue-600" /></div>;
@@ -221,17 +262,7 @@ const JobApplicants = () => {
               </div>
 
               {/* Middle Row: Cover Letter */}
-              {app.cover_letter && (
-                <div className="relative bg-slate-50/50 rounded-2xl p-6 border border-slate-100">
-                  <Quote className="absolute top-4 right-4 text-slate-200" size={40} />
-                  <h3 className="text-xs font-black uppercase tracking-widest text-blue-600 mb-3 flex items-center gap-2">
-                    <FileText size={14} /> Cover Letter
-                  </h3>
-                  <p className="text-slate-600 text-sm leading-relaxed font-medium whitespace-pre-wrap break-words relative z-10">
-                    {app.cover_letter}
-                  </p>
-                </div>
-              )}
+              {app.has_cover_letter && <CoverLetter applicationId={app.id} />}
 
               {/* Bottom Row: Resume Download */}
               <div className="flex items-center justify-between pt-6 border-t border-slate-50">
@@ -245,7 +276,7 @@ const JobApplicants = () => {
                   <Button
                     type="button"
                     variant="outline"
-                    onClick={() => handleOpenResume(app.resume_path)}
+                    onClick={() => handleOpenResume(app)}
                     disabled={!app.resume_path}
                     className="rounded-xl h-11 px-5 font-bold"
                   >
@@ -256,7 +287,7 @@ const JobApplicants = () => {
                     type="button"
                     onClick={() =>
                       handleDownloadResume(
-                        app.resume_path,
+                        app,
                         app.resume_filename ?? `Resume_${app.user_id}.pdf`
                       )
                     }
@@ -271,6 +302,16 @@ const JobApplicants = () => {
             </div>
           </div>
         ))}
+        {hasNextPage && (
+          <Button
+            variant="outline"
+            onClick={() => fetchNextPage()}
+            disabled={isFetchingNextPage}
+            className="rounded-xl h-11 px-6 font-bold w-fit mx-auto"
+          >
+            {isFetchingNextPage ? <Loader2 className="animate-spin" size={18} /> : "Load more"}
+          </Button>
+        )}
       </div>
     </div>
   );